@@ -27,36 +27,46 @@ NOTAS:
 """
 
 from __future__ import annotations
-from typing import Dict, List, Set, Tuple
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 import sys
 
 # ==============================
 #  Constantes y utilidades
 # ==============================
 
-ALIAS_EPSILON: Set[str] = {"ε", "epsilon", "EPS", "lambda", "Λ", "e"}
+ALIAS_EPSILON: FrozenSet[str] = frozenset({"ε", "epsilon", "EPS", "lambda", "Λ", "e"})
 MARCADOR_FIN: str = "$"       # símbolo especial de fin de entrada para FOLLOW(S)
 EPS: str = "ε"                # representación canónica de epsilon
 
+# Conjuntos unitarios constantes (evitan crear {EPS} / {'$'} en cada uso)
+_EPS_SET: FrozenSet[str] = frozenset({EPS})
+_FIN_SET: FrozenSet[str] = frozenset({MARCADOR_FIN})
+
+
+# Alias de epsilon -> 'ε' (un solo lookup por token)
+EPS_MAP: Dict[str, str] = {a: EPS for a in ALIAS_EPSILON}
+
 
 def normalizar_token(token: str) -> str:
     """Devuelve el token normalizado: si es un alias de epsilon lo mapea a 'ε'."""
     token = token.strip()
-    return EPS if token in ALIAS_EPSILON else token
+    return EPS_MAP.get(token, token)
 
 
 # ==============================
 #  Lectura y representación de la gramática
 # ==============================
 
-def parsear_gramatica(lineas: List[str]) -> Tuple[Dict[str, List[List[str]]], str]:
+def parsear_gramatica(lineas: Iterable[str]) -> Tuple[Dict[str, List[List[str]]], str]:
     """
     Parsea líneas de texto y construye la gramática en un diccionario:
       gramática: { NoTerminal: [ [símbolos], [símbolos], ... ] }
     Además devuelve el símbolo inicial (primer LHS encontrado).
     """
-    gramatica: Dict[str, List[List[str]]] = {}
-    simbolo_inicial: str | None = None
+    gramatica: DefaultDict[str, List[List[str]]] = defaultdict(list)
+    simbolo_inicial: Optional[str] = None
 
     for cruda in lineas:
         linea = cruda.strip()
@@ -75,45 +85,133 @@ def parsear_gramatica(lineas: List[str]) -> Tuple[Dict[str, List[List[str]]], st
         if simbolo_inicial is None:
             simbolo_inicial = lhs
 
-        alternativas = [alt.strip() for alt in rhs.split("|")]
-        producciones: List[List[str]] = []
-        for alt in alternativas:
-            # Soportar epsilon explícita o producción vacía
-            if alt == "" or alt in ALIAS_EPSILON:
-                producciones.append([EPS])
-            else:
-                tokens = [normalizar_token(t) for t in alt.split()]
-                if not tokens:
-                    tokens = [EPS]
-                producciones.append(tokens)
+        # split() ya separa y recorta los símbolos; un alias de ε se normaliza
+        # con EPS_MAP y una alternativa vacía se toma como epsilon.
+        producciones: List[List[str]] = [
+            [EPS_MAP.get(t, t) for t in alt.split()] or [EPS]
+            for alt in rhs.split("|")
+        ]
 
-        gramatica.setdefault(lhs, []).extend(producciones)
+        gramatica[lhs].extend(producciones)
 
     if simbolo_inicial is None:
         raise ValueError("No se encontró ninguna producción en la gramática.")
-    return gramatica, simbolo_inicial
+    return dict(gramatica), simbolo_inicial
+
+
+Simbolos = Tuple[FrozenSet[str], FrozenSet[str]]
 
 
-def conjuntos_de_simbolos(gramatica: Dict[str, List[List[str]]]) -> Tuple[Set[str], Set[str]]:
+def conjuntos_de_simbolos(gramatica: Dict[str, List[List[str]]]) -> Simbolos:
     """
-    Devuelve (NO_TERMINALES, TERMINALES) deducidos de la gramática.
+    Devuelve (NO_TERMINALES, TERMINALES) deducidos de la gramática, en una sola pasada.
     - No terminales: claves del diccionario (LHS).
     - Terminales: símbolos que aparecen en RHS y NO son no terminales ni ε.
+    Se calcula una vez (en `main`) y se pasa a `calcular_primeros`/`calcular_siguientes`.
     """
-    no_terminales = set(gramatica.keys())
+    no_terminales = frozenset(gramatica)
     simbolos_rhs: Set[str] = set()
     for producciones in gramatica.values():
         for alternativa in producciones:
             simbolos_rhs.update(alternativa)
-    terminales = {s for s in simbolos_rhs if s not in no_terminales and s != EPS}
-    return no_terminales, terminales
+    simbolos_rhs -= no_terminales
+    simbolos_rhs.discard(EPS)
+    return no_terminales, frozenset(simbolos_rhs)
+
+
+# ==============================
+#  Tabla de símbolos enteros
+# ==============================
+
+EPS_ID: int = 0   # ε ocupa siempre el identificador 0
+EPS_BIT: int = 1 << EPS_ID
+SIN_EPS: int = ~EPS_BIT   # máscara para quitar ε de un conjunto
+
+@dataclass
+class GramaticaCompilada:
+    """
+    Forma compilada de la gramática, construida una sola vez y compartida por
+    PRIMEROS, SIGUIENTES y la impresión.
+      - id 0: ε;  ids 1..n_nt: no terminales;  luego terminales (ordenados).
+      - Si '$' no es un terminal de la gramática se agrega al final (lo usa SIGUIENTES).
+    Con ids enteros cada conjunto se guarda como máscara de bits (bit i = símbolo i).
+    """
+    # slots a mano en vez de dataclass(slots=True), que pide Python 3.10
+    __slots__ = ("id_sym", "sym_id", "producciones", "n_nt", "n_gramatica", "inicial", "usos")
+    id_sym: List[str]                               # id -> símbolo
+    sym_id: Dict[str, int]                          # símbolo -> id
+    producciones: List[Tuple[int, Tuple[int, ...]]] # (A, (X1, ..., Xk))
+    n_nt: int                                       # cantidad de no terminales
+    n_gramatica: int                                # ε + no terminales + terminales
+    inicial: int                                    # id del símbolo inicial
+    usos: List[List[int]]                           # X -> producciones que contienen X
+
+    def a_conjuntos(self, mascaras: List[int], ids: Iterable[int]) -> Dict[str, Set[str]]:
+        """Traduce las máscaras de los ids dados a { símbolo: conjunto de símbolos }."""
+        id_sym = self.id_sym
+        return {id_sym[X]: expandir_mascara(mascaras[X], id_sym) for X in ids}
+
+
+def compilar_gramatica(gramatica: Dict[str, List[List[str]]],
+                       simbolo_inicial: Optional[str] = None,
+                       simbolos: Optional[Simbolos] = None) -> GramaticaCompilada:
+    """
+    Asigna a cada símbolo un entero pequeño, reescribe las producciones con esos
+    enteros y precalcula el índice inverso de usos de cada símbolo.
+    Si no se indica el símbolo inicial se toma el primer LHS (como en parsear_gramatica).
+    """
+    no_terminales, terminales = simbolos or conjuntos_de_simbolos(gramatica)
+    id_sym: List[str] = [EPS, *sorted(no_terminales), *sorted(terminales)]
+    n_gramatica = len(id_sym)
+    if MARCADOR_FIN not in terminales:
+        id_sym.append(MARCADOR_FIN)
+    sym_id: Dict[str, int] = {s: i for i, s in enumerate(id_sym)}
+
+    producciones = [
+        (sym_id[A], tuple(sym_id[X] for X in alfa))
+        for A, alternativas in gramatica.items() for alfa in alternativas
+    ]
+    usos: List[List[int]] = [[] for _ in range(n_gramatica)]
+    for k, (_, alfa) in enumerate(producciones):
+        for X in alfa:
+            usos[X].append(k)
+
+    if simbolo_inicial is None:
+        simbolo_inicial = next(iter(gramatica))
+    return GramaticaCompilada(
+        id_sym=id_sym,
+        sym_id=sym_id,
+        producciones=producciones,
+        n_nt=len(no_terminales),
+        n_gramatica=n_gramatica,
+        inicial=sym_id[simbolo_inicial],
+        usos=usos,
+    )
+
+
+def comprimir_conjunto(conjunto: Set[str], sym_id: Dict[str, int]) -> int:
+    """Convierte un conjunto de símbolos en máscara de bits (bit i = símbolo con id i)."""
+    mascara = 0
+    for s in conjunto:
+        mascara |= 1 << sym_id[s]
+    return mascara
+
+
+def expandir_mascara(mascara: int, id_sym: List[str]) -> Set[str]:
+    """Convierte una máscara de bits de vuelta a un conjunto de símbolos."""
+    conjunto: Set[str] = set()
+    while mascara:
+        bajo = mascara & -mascara
+        conjunto.add(id_sym[bajo.bit_length() - 1])
+        mascara ^= bajo
+    return conjunto
 
 
 # ==============================
 #  Cálculo de PRIMEROS (FIRST)
 # ==============================
 
-def calcular_primeros(gramatica: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
+def primeros_mascaras(gc: GramaticaCompilada) -> List[int]:
     """
     Calcula PRIMEROS(X) para cada símbolo X (no terminales y terminales).
     Reglas básicas:
@@ -122,58 +220,88 @@ def calcular_primeros(gramatica: Dict[str, List[List[str]]]) -> Dict[str, Set[st
           * Agregar PRIMEROS(X1)  {ε} a PRIMEROS(A).
           * Si X1 ⇒* ε, entonces también mirar X2, etc.
           * Si TODOS X1..Xk ⇒* ε, agregar ε a PRIMEROS(A).
+    Devuelve una máscara de bits por id de símbolo.
     """
-    no_terminales, terminales = conjuntos_de_simbolos(gramatica)
-    PRIMEROS: Dict[str, Set[str]] = {A: set() for A in no_terminales}
-
-    # FIRST para terminales y ε
-    for t in terminales:
-        PRIMEROS[t] = {t}
-    PRIMEROS[EPS] = {EPS}
-
-    cambio = True
-    while cambio:
-        cambio = False
-        for A, producciones in gramatica.items():
-            for alfa in producciones:
-                acumulado: Set[str] = set()
-                prefijo_anulable = True
-
-                for X in alfa:
-                    # Añadir PRIMEROS(X) sin ε
-                    acumulado |= (PRIMEROS.get(X, {X}) - {EPS})
-                    if EPS in PRIMEROS.get(X, set()):
-                        # Continuamos con el siguiente símbolo
-                        continue
-                    else:
-                        prefijo_anulable = False
-                        break
-
-                if prefijo_anulable:
-                    acumulado.add(EPS)
-
-                antes = len(PRIMEROS[A])
-                PRIMEROS[A] |= acumulado
-                if len(PRIMEROS[A]) != antes:
-                    cambio = True
-
-    return PRIMEROS
-
-
-def primeros_de_secuencia(secuencia: List[str], PRIMEROS: Dict[str, Set[str]]) -> Set[str]:
+    producciones, usos = gc.producciones, gc.usos
+
+    # FIRST como máscara de bits (bit i = símbolo i). ε y terminales: { X };
+    # los no terminales empiezan vacíos.
+    primeros: List[int] = [1 << X for X in range(len(gc.id_sym))]
+    for A in range(1, gc.n_nt + 1):
+        primeros[A] = 0
+
+    # Con el índice inverso `usos`, cuando PRIMEROS(X) crece solo hay que
+    # re-evaluar las producciones que contienen X.
+    pendientes = deque(range(len(producciones)))
+    en_cola = [True] * len(producciones)
+
+    while pendientes:
+        k = pendientes.popleft()
+        en_cola[k] = False
+        A, alfa = producciones[k]
+
+        # Se suman las máscaras tal cual; ε solo se quita (una vez) si algún X
+        # no es anulable.
+        acumulado = EPS_BIT
+        for X in alfa:
+            mascara = primeros[X]
+            acumulado |= mascara
+            if not mascara & EPS_BIT:
+                acumulado &= SIN_EPS
+                break
+
+        # Un solo OR + comparación de enteros detecta si PRIMEROS(A) creció
+        viejo = primeros[A]
+        nuevo = viejo | acumulado
+        if nuevo != viejo:
+            primeros[A] = nuevo
+            for dep in usos[A]:
+                if not en_cola[dep]:
+                    en_cola[dep] = True
+                    pendientes.append(dep)
+
+    return primeros
+
+
+def calcular_primeros(gramatica: Dict[str, List[List[str]]],
+                      simbolos: Optional[Simbolos] = None) -> Dict[str, Set[str]]:
+    """PRIMEROS(X) como { símbolo: conjunto } (ver `primeros_mascaras`)."""
+    gc = compilar_gramatica(gramatica, simbolos=simbolos)
+    return gc.a_conjuntos(primeros_mascaras(gc), range(gc.n_gramatica))
+
+
+def primeros_de_secuencia(secuencia: List[str], PRIMEROS: Dict[str, Set[str]],
+                          first_no_eps: Optional[Dict[str, Set[str]]] = None,
+                          nullable: Optional[Dict[str, bool]] = None) -> Set[str]:
     """
     PRIMEROS de una secuencia de símbolos X1 X2 ... Xk.
     Agrega PRIMEROS(Xi)  {ε} hasta que uno no sea anulable.
     Si todos son anulables, incluir ε.
+    Si se pasan `first_no_eps` y `nullable` (precalculados) se usan directamente;
+    si no, se mira PRIMEROS solo para los símbolos de la secuencia.
     """
     resultado: Set[str] = set()
     prefijo_anulable = True
 
+    if first_no_eps is None or nullable is None:
+        for X in secuencia:
+            P = PRIMEROS.get(X)
+            if P is None:
+                resultado.add(X)
+                prefijo_anulable = False
+                break
+            resultado |= P
+            if EPS not in P:
+                prefijo_anulable = False
+                break
+        resultado.discard(EPS)
+        if prefijo_anulable:
+            resultado.add(EPS)
+        return resultado
+
     for X in secuencia:
-        resultado |= (PRIMEROS.get(X, {X}) - {EPS})
-        if EPS in PRIMEROS.get(X, set()):
-            continue
-        else:
+        resultado |= first_no_eps.get(X, {X})
+        if not nullable.get(X, False):
             prefijo_anulable = False
             break
 
@@ -187,9 +315,64 @@ def primeros_de_secuencia(secuencia: List[str], PRIMEROS: Dict[str, Set[str]]) -
 #  Cálculo de SIGUIENTES (FOLLOW)
 # ==============================
 
-def calcular_siguientes(gramatica: Dict[str, List[List[str]]],
-                        simbolo_inicial: str,
-                        PRIMEROS: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+def componentes_fuertes(n: int, aristas: List[List[int]]) -> List[List[int]]:
+    """
+    Componentes fuertemente conexas (Tarjan, versión iterativa) de un grafo con
+    nodos 0..n-1. Se devuelven en orden topológico inverso: una componente
+    aparece después de todas las alcanzables desde ella.
+    """
+    indice = [-1] * n
+    bajo = [0] * n
+    en_pila = [False] * n
+    pila: List[int] = []
+    componentes: List[List[int]] = []
+    contador = 0
+
+    for raiz in range(n):
+        if indice[raiz] != -1:
+            continue
+        trabajo: List[Tuple[int, int]] = [(raiz, 0)]
+        while trabajo:
+            v, i = trabajo.pop()
+            if i == 0:
+                indice[v] = bajo[v] = contador
+                contador += 1
+                pila.append(v)
+                en_pila[v] = True
+
+            vecinos = aristas[v]
+            descender = False
+            while i < len(vecinos):
+                w = vecinos[i]
+                i += 1
+                if indice[w] == -1:
+                    trabajo.append((v, i))
+                    trabajo.append((w, 0))
+                    descender = True
+                    break
+                if en_pila[w] and indice[w] < bajo[v]:
+                    bajo[v] = indice[w]
+            if descender:
+                continue
+
+            if bajo[v] == indice[v]:
+                miembros: List[int] = []
+                while True:
+                    w = pila.pop()
+                    en_pila[w] = False
+                    miembros.append(w)
+                    if w == v:
+                        break
+                componentes.append(miembros)
+            if trabajo:
+                padre = trabajo[-1][0]
+                if bajo[v] < bajo[padre]:
+                    bajo[padre] = bajo[v]
+
+    return componentes
+
+
+def siguientes_mascaras(gc: GramaticaCompilada, primeros: List[int]) -> List[int]:
     """
     Calcula SIGUIENTES(A) para cada no terminal A.
     Reglas usadas:
@@ -197,44 +380,64 @@ def calcular_siguientes(gramatica: Dict[str, List[List[str]]],
       2) Para cada producción A -> α B β:
          - Agregar PRIMEROS(β) {ε} a SIGUIENTES(B).
          - Si β ⇒* ε (o β está vacío), agregar también SIGUIENTES(A) a SIGUIENTES(B).
+    `primeros` son las máscaras de `primeros_mascaras`. Devuelve una máscara por
+    id de no terminal (el índice 0 no se usa).
     """
-    no_terminales, _ = conjuntos_de_simbolos(gramatica)
-    SIGUIENTES: Dict[str, Set[str]] = {A: set() for A in no_terminales}
-    SIGUIENTES[simbolo_inicial].add(MARCADOR_FIN)
-
-    cambio = True
-    while cambio:
-        cambio = False
-        for A, producciones in gramatica.items():
-            for alfa in producciones:
-                n = len(alfa)
-                for i, B in enumerate(alfa):
-                    if B not in no_terminales:
-                        continue  # Solo interesa cuando B es no terminal
-                    beta = alfa[i + 1:]
-
-                    if beta:
-                        primer_beta = primeros_de_secuencia(beta, PRIMEROS)
-                        agregar = primer_beta - {EPS}
-
-                        antes = len(SIGUIENTES[B])
-                        SIGUIENTES[B] |= agregar
-                        if len(SIGUIENTES[B]) != antes:
-                            cambio = True
-
-                        if EPS in primer_beta:
-                            antes = len(SIGUIENTES[B])
-                            SIGUIENTES[B] |= SIGUIENTES[A]
-                            if len(SIGUIENTES[B]) != antes:
-                                cambio = True
-                    else:
-                        # B es el último símbolo: propagar SIGUIENTES(A) -> SIGUIENTES(B)
-                        antes = len(SIGUIENTES[B])
-                        SIGUIENTES[B] |= SIGUIENTES[A]
-                        if len(SIGUIENTES[B]) != antes:
-                            cambio = True
-
-    return SIGUIENTES
+    n_nt = gc.n_nt
+    siguientes: List[int] = [0] * (n_nt + 1)
+    siguientes[gc.inicial] = 1 << gc.sym_id[MARCADOR_FIN]
+
+    # Aportes fijos (PRIMEROS(β) sin ε) se agregan una sola vez; lo que se
+    # propaga es SIGUIENTES(A) -> SIGUIENTES(B) cuando β ⇒* ε.
+    # Cada producción se recorre de derecha a izquierda llevando PRIMEROS del
+    # sufijo ya visto, así PRIMEROS(β) de cada posición sale en O(1).
+    dependientes: List[List[int]] = [[] for _ in range(n_nt + 1)]
+    for A, alfa in gc.producciones:
+        sufijo = EPS_BIT   # PRIMEROS(β) con β vacío
+        for B in reversed(alfa):
+            if 1 <= B <= n_nt:
+                siguientes[B] |= sufijo & SIN_EPS
+                # β vacío o anulable: SIGUIENTES(A) fluye a SIGUIENTES(B)
+                if sufijo & EPS_BIT and B not in dependientes[A]:
+                    dependientes[A].append(B)
+
+            mascara = primeros[B]
+            sufijo = (mascara & SIN_EPS) | sufijo if mascara & EPS_BIT else mascara
+
+    # Las aristas A -> B forman un grafo; cada componente fuertemente conexa
+    # comparte el mismo SIGUIENTES. Recorriendo las componentes en orden
+    # topológico basta una sola pasada (sin punto fijo).
+    componente: List[int] = [0] * (n_nt + 1)
+    componentes = componentes_fuertes(n_nt + 1, dependientes)
+    for c, miembros in enumerate(componentes):
+        for A in miembros:
+            componente[A] = c
+
+    for c in reversed(range(len(componentes))):   # fuentes primero
+        miembros = componentes[c]
+        valor = 0
+        for A in miembros:
+            valor |= siguientes[A]
+        for A in miembros:
+            siguientes[A] = valor
+            for B in dependientes[A]:
+                if componente[B] != c:
+                    siguientes[B] |= valor
+
+    return siguientes
+
+
+def calcular_siguientes(gramatica: Dict[str, List[List[str]]],
+                        simbolo_inicial: str,
+                        PRIMEROS: Dict[str, Set[str]],
+                        simbolos: Optional[Simbolos] = None) -> Dict[str, Set[str]]:
+    """SIGUIENTES(A) como { no terminal: conjunto } (ver `siguientes_mascaras`)."""
+    gc = compilar_gramatica(gramatica, simbolo_inicial, simbolos)
+    primeros: List[int] = [1 << X for X in range(len(gc.id_sym))]
+    for X, P in PRIMEROS.items():
+        if X in gc.sym_id:
+            primeros[gc.sym_id[X]] = comprimir_conjunto(P, gc.sym_id)
+    return gc.a_conjuntos(siguientes_mascaras(gc, primeros), range(1, gc.n_nt + 1))
 
 
 # ==============================
@@ -254,8 +457,14 @@ def imprimir_conjuntos(titulo: str, conjuntos: Dict[str, Set[str]]) -> None:
     - Muestra cada símbolo entre comillas.
     """
     print(titulo)
-    for A in sorted(conjuntos.keys()):
-        elems_ordenados = sorted(conjuntos[A], key=lambda x: (x == MARCADOR_FIN, x))
+    for A in sorted(conjuntos):
+        elems = conjuntos[A]
+        # '$' al final: se ordena el resto y se agrega después (sin key por elemento)
+        if MARCADOR_FIN in elems:
+            elems_ordenados = sorted(elems - _FIN_SET)
+            elems_ordenados.append(MARCADOR_FIN)
+        else:
+            elems_ordenados = sorted(elems)
         elementos = ", ".join(formatear_simbolo(x) for x in elems_ordenados)
         print(f"  {A:>15}: {{ {elementos} }}")
     print()
@@ -265,10 +474,10 @@ def imprimir_conjuntos(titulo: str, conjuntos: Dict[str, Set[str]]) -> None:
 #  Utilidades de E/S
 # ==============================
 
-def leer_archivo(ruta: str) -> List[str]:
-    """Lee y devuelve todas las líneas de un archivo de texto en UTF-8."""
+def iter_lineas(ruta: str) -> Iterator[str]:
+    """Recorre las líneas de un archivo de texto en UTF-8 sin cargarlo entero."""
     with open(ruta, "r", encoding="utf-8") as f:
-        return f.readlines()
+        yield from f
 
 
 # ==============================
@@ -278,8 +487,7 @@ def leer_archivo(ruta: str) -> List[str]:
 def main(argv: List[str]) -> None:
     # Si se pasa una ruta, parsea esa gramática; en caso contrario usa una demo mínima.
     if len(argv) >= 2:
-        lineas = leer_archivo(argv[1])
-        gramatica, simbolo_inicial = parsear_gramatica(lineas)
+        gramatica, simbolo_inicial = parsear_gramatica(iter_lineas(argv[1]))
     else:
         demo = [
            " S' -> S" ,
@@ -297,13 +505,16 @@ def main(argv: List[str]) -> None:
         print()
         gramatica, simbolo_inicial = parsear_gramatica(demo)
 
-    PRIMEROS = calcular_primeros(gramatica)
-    SIGUIENTES = calcular_siguientes(gramatica, simbolo_inicial, PRIMEROS)
+    # La gramática se compila una vez y se reutiliza en todos los pasos
+    gc = compilar_gramatica(gramatica, simbolo_inicial)
+    primeros = primeros_mascaras(gc)
+    siguientes = siguientes_mascaras(gc, primeros)
+    no_terminales = range(1, gc.n_nt + 1)
 
     print(f"Símbolo inicial: {simbolo_inicial}\n")
     # Solo imprimimos PRIMEROS de los no terminales definidos por el usuario
-    imprimir_conjuntos("PRIMEROS:", {k: v for k, v in PRIMEROS.items() if k in gramatica})
-    imprimir_conjuntos("SIGUIENTES:", SIGUIENTES)
+    imprimir_conjuntos("PRIMEROS:", gc.a_conjuntos(primeros, no_terminales))
+    imprimir_conjuntos("SIGUIENTES:", gc.a_conjuntos(siguientes, no_terminales))
 
 
 if __name__ == "__main__":
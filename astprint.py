@@ -5,225 +5,426 @@
 # 3) print_rich_tree(ast)   -> helper para imprimir el rich.Tree (si lo quieres desde aquí)
 # -----------------------------------------------------------------------------
 
-from graphviz import Digraph
+import os
+import subprocess
+import sys
+from itertools import count
+from types import GeneratorType
+
 from model import *
 from typing import Optional, List
 
 # =============================================================================
-# 1) GRAPHVIZ: AST -> Digraph
+# 1) GRAPHVIZ: AST -> texto DOT
 # =============================================================================
 
-class ASTPrinter(Visitor):
-    node_defaults = {
-        "shape": "ellipse",
-        "color": "purple",
-        "style": "filled",
-    }
-    edge_defaults = {"arrowhead": "normal"}
+def _dot_attrs(attrs: dict) -> str:
+    return " ".join(f"{k}={v}" for k, v in attrs.items())
+
+
+# Caracteres especiales dentro de una etiqueta DOT entre comillas
+_GV_ESCAPES = str.maketrans({'"': '\\"', '\\': '\\\\', '\n': '\\n'})
+
+
+def _escape(label: str) -> str:
+    """Escapa la etiqueta para ponerla entre comillas dobles (un solo translate)."""
+    return label.translate(_GV_ESCAPES)
+
 
-    def __init__(self):
-        self.dot = Digraph("AST")
-        self.dot.attr("node", **self.node_defaults)
-        self.dot.attr("edge", **self.edge_defaults)
-        self._seq = 0
+# Atributo ` [label="..."]` ya escapado por etiqueta de arista: son pocas
+# ("type", "init", "cond", ...) y se repiten en cada nodo del mismo tipo
+_EDGE_ATTRS: dict = {}
+
+
+# Etiquetas de los operadores postfijos ya armadas: se reusa el mismo
+# objeto str en vez de formatear uno nuevo por nodo
+_POSTFIX_LABELS = {"++": "++(post)", "--": "--(post)"}
+
+
+class DotGraph:
+    """
+    Fuente DOT ya generada. Expone `.source` y `.render(...)` igual que el
+    Digraph de graphviz que se usaba antes, así los llamadores no cambian.
+    Guarda los trozos tal como los emitió ASTPrinter; el texto completo solo
+    se arma si alguien pide `.source`.
+    """
+    def __init__(self, chunks: List[str]):
+        self._chunks = chunks
+        self._source: Optional[str] = None
 
     @property
-    def name(self):
-        self._seq += 1
-        return f"n{self._seq:05d}"
+    def source(self) -> str:
+        if self._source is None:
+            self._source = "".join(self._chunks)
+        return self._source
+
+    def save(self, path: str) -> None:
+        # Los trozos pasan por el buffer del archivo y se codifican por partes:
+        # no se arma el texto entero ni su copia en bytes
+        with open(path, "w", encoding="utf-8", newline="", buffering=1 << 16) as f:
+            f.writelines(self._chunks)
+
+    def render(self, filename: str, format: str = "png", cleanup: bool = False) -> str:
+        # El DOT va por stdin a `dot -T<fmt>`: sin archivo fuente temporal que
+        # escribir y luego borrar (`cleanup` queda solo por compatibilidad).
+        # BMINOR_DOT permite usar otro ejecutable compatible con la CLI de dot.
+        out_path = f"{filename}.{format}"
+        subprocess.run(
+            [os.environ.get("BMINOR_DOT", "dot"), f"-T{format}", "-o", out_path],
+            input=self.source.encode("utf-8"),
+            check=True,
+        )
+        return out_path
+
+
+# Estilos de nodo/arista: (node_defaults, edge_defaults).
+# "blue" es el del astprint original del profe.
+STYLE_PRESETS = {
+    "purple": ({"shape": "ellipse", "color": "purple", "style": "filled"},
+               {"arrowhead": "normal"}),
+    "blue":   ({"shape": "box", "color": "deepskyblue", "style": "filled"},
+               {"arrowhead": "none"}),
+}
+
+
+def render_dot_files(dot_paths: List[str], format: str = "png") -> List[str]:
+    """
+    Renderiza varios .dot con una sola ejecución de dot (`-O`), en vez de un
+    proceso por archivo. dot -O escribe `x.dot.png`; se renombra a `x.png`
+    para que quede igual que con DotGraph.render. Devuelve las rutas.
+    """
+    dot_paths = list(dict.fromkeys(dot_paths))   # sin repetidos, en orden
+    if not dot_paths:
+        return []
+    subprocess.run([os.environ.get("BMINOR_DOT", "dot"), f"-T{format}", "-O", *dot_paths], check=True)
+    outs = []
+    for path in dot_paths:
+        out = f"{os.path.splitext(path)[0]}.{format}"
+        os.replace(f"{path}.{format}", out)
+        outs.append(out)
+    return outs
+
+
+class ASTPrinter(Visitor):
+    node_defaults, edge_defaults = STYLE_PRESETS["purple"]
+
+    __slots__ = ("_out", "_emit", "_ids", "_leaf_cache", "_compact")
+
+    def __init__(self, share_leaves: bool = True, compact: bool = False, style: Optional[str] = None):
+        if style is None:
+            node_defaults, edge_defaults = self.node_defaults, self.edge_defaults
+        else:
+            node_defaults, edge_defaults = STYLE_PRESETS[style]
+        # Las líneas DOT se van acumulando y se unen una sola vez en render()
+        self._out: List[str] = [
+            "digraph AST {\n",
+            f"\tnode [{_dot_attrs(node_defaults)}]\n",
+            f"\tedge [{_dot_attrs(edge_defaults)}]\n",
+        ]
+        self._emit = self._out.append   # append ya ligado: una búsqueda menos por línea
+        self._ids = count(1)   # n00001, n00002, ... (el contador avanza en C)
+        # Hojas (tipos, ids, literales) con la misma etiqueta comparten nodo;
+        # el dibujo pasa a ser un DAG. Con share_leaves=False sigue siendo árbol.
+        self._leaf_cache: Optional[dict] = {} if share_leaves else None
+        # Estilo compacto: etiquetas de una sola línea; el tipo se distingue
+        # por la forma del nodo en vez de por el prefijo "Type"
+        self._compact = compact
 
     @classmethod
-    def render(cls, n: Node) -> Digraph:
-        p = cls()
+    def render(cls, n: Node, share_leaves: bool = True, compact: bool = False,
+               style: Optional[str] = None) -> DotGraph:
+        p = cls(share_leaves, compact, style)
         n.accept(p)
-        return p.dot
+        p._out.append("}\n")
+        return DotGraph(p._out)
+
+    # ---- despacho ------------------------------------------------------------
+    # type(nodo) -> método `_visit_<Clase>`; se resuelve una vez por clase
+    # (recorriendo el MRO) y queda cacheado, así cada visita es un lookup.
+    _dispatch: dict = {}
+
+    def visit(self, n: Node):
+        # Recorrido iterativo: los `_visit_*` con hijos son generadores que
+        # hacen `yield hijo` y reciben el id del hijo; aquí se apilan en vez
+        # de recursar con accept(), así no hay límite de profundidad.
+        stack = []
+        result = self._start(n, stack)
+        while stack:
+            try:
+                child = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+            else:
+                result = self._start(child, stack)
+        return result
+
+    def _start(self, n: Node, stack: list):
+        method = self._dispatch.get(type(n))
+        if method is None:
+            method = self._resolve(type(n))
+        res = method(self, n)
+        if isinstance(res, GeneratorType):
+            stack.append(res)
+            return None   # el primer send() de un generador debe ser None
+        return res
+
+    @classmethod
+    def _resolve(cls, node_cls: type):
+        if "_dispatch" not in cls.__dict__:   # cada subclase con su propia caché
+            cls._dispatch = {}
+        for klass in node_cls.__mro__:
+            method = getattr(cls, f"_visit_{klass.__name__}", None)
+            if method is not None:
+                break
+        else:
+            method = cls._visit_fallback
+        cls._dispatch[node_cls] = method
+        return method
+
+    def _visit_fallback(self, n: Node):
+        # Nodos sin visitante propio: se dibujan solo con su nombre de clase
+        return self._new(n.__class__.__name__)
 
     # ---- helpers -------------------------------------------------------------
     def _new(self, label: str, **attrs) -> str:
-        nid = self.name
-        self.dot.node(nid, label=label, **attrs)
+        nid = f"n{next(self._ids):05d}"
+        extra = f" {_dot_attrs(attrs)}" if attrs else ""
+        self._emit(f'\t{nid} [label="{_escape(label)}"{extra}]\n')
+        return nid
+
+    def _leaf(self, label: str, **attrs) -> str:
+        cache = self._leaf_cache
+        if cache is None:
+            return self._new(label, **attrs)
+        key = (label, tuple(attrs.items())) if attrs else label
+        nid = cache.get(key)
+        if nid is None:
+            nid = cache[key] = self._new(label, **attrs)
         return nid
 
+    def _named(self, kind: str, name: str) -> str:
+        return f"{kind} {name}" if self._compact else f"{kind}\n{name}"
+
     def _edge(self, a: str, b: str, label: Optional[str] = None):
         if label is None:
-            self.dot.edge(a, b)
+            self._emit(f"\t{a} -> {b}\n")
         else:
-            self.dot.edge(a, b, label=label)
+            attr = _EDGE_ATTRS.get(label)
+            if attr is None:
+                attr = _EDGE_ATTRS[label] = f' [label="{_escape(label)}"]'
+            self._emit(f"\t{a} -> {b}{attr}\n")
 
     def _maybe_child(self, parent_id: str, label: str, value):
         if value is None:
             return
         if isinstance(value, Node):
-            self._edge(parent_id, value.accept(self), label)
+            self._edge(parent_id, (yield value), label)
         else:
             leaf = self._new(str(value))
             self._edge(parent_id, leaf, label)
 
     # ---- Programa / Bloques --------------------------------------------------
-    def visit(self, n: Program):
+    def _visit_Program(self, n: Program):
         me = self._new("Program")
         for s in n.body:
-            self._edge(me, s.accept(self))
+            self._edge(me, (yield s))
         return me
 
-    def visit(self, n: Block):
+    def _visit_Block(self, n: Block):
         me = self._new("Block")
         for s in n.stmts:
-            self._edge(me, s.accept(self))
+            self._edge(me, (yield s))
         return me
 
     # ---- Declaraciones / Tipos -----------------------------------------------
-    def visit(self, n: VarDecl):
-        me = self._new(f"VarDecl\\n{n.name}")
+    def _visit_VarDecl(self, n: VarDecl):
+        me = self._new(self._named("VarDecl", n.name))
         if n.type is not None:
-            self._edge(me, n.type.accept(self), "type")
+            self._edge(me, (yield n.type), "type")
         if n.init is not None:
-            self._edge(me, n.init.accept(self), "init")
+            self._edge(me, (yield n.init), "init")
         return me
 
-    def visit(self, n: SimpleType):
-        return self._new(f"Type\\n{n.name}")
+    def _visit_SimpleType(self, n: SimpleType):
+        if self._compact:
+            return self._leaf(n.name, shape="box")
+        return self._leaf(f"Type\n{n.name}")
 
-    def visit(self, n: ArrayType):
+    def _visit_ArrayType(self, n: ArrayType):
         me = self._new("ArrayType")
         if n.base is not None:
-            self._edge(me, n.base.accept(self), "base")
-        self._maybe_child(me, "size", n.size)
+            self._edge(me, (yield n.base), "base")
+        yield from self._maybe_child(me, "size", n.size)
         return me
 
-    def visit(self, n: FuncType):
+    def _visit_FuncType(self, n: FuncType):
         me = self._new("FuncType")
         if n.ret is not None:
-            self._edge(me, n.ret.accept(self), "ret")
+            self._edge(me, (yield n.ret), "ret")
         if n.params:
             params_node = self._new("Params")
             self._edge(me, params_node)
             for p in n.params:
-                self._edge(params_node, p.accept(self))
+                self._edge(params_node, (yield p))
         return me
 
-    def visit(self, n: Param):
-        me = self._new(f"Param\\n{n.name}")
+    def _visit_Param(self, n: Param):
+        me = self._new(self._named("Param", n.name))
         if n.type is not None:
-            self._edge(me, n.type.accept(self), "type")
+            self._edge(me, (yield n.type), "type")
         return me
 
     # ---- Sentencias ----------------------------------------------------------
-    def visit(self, n: PrintStmt):
+    def _visit_PrintStmt(self, n: PrintStmt):
         me = self._new("Print")
         for a in n.args:
-            self._edge(me, a.accept(self))
+            self._edge(me, (yield a))
         return me
 
-    def visit(self, n: ReturnStmt):
+    def _visit_ReturnStmt(self, n: ReturnStmt):
         me = self._new("Return")
         if n.expr is not None:
-            self._edge(me, n.expr.accept(self))
+            self._edge(me, (yield n.expr))
         return me
 
-    def visit(self, n: IfStmt):
+    def _visit_IfStmt(self, n: IfStmt):
         me = self._new("If")
         if n.cond is not None:
-            self._edge(me, n.cond.accept(self), "cond")
+            self._edge(me, (yield n.cond), "cond")
         if n.then is not None:
-            self._edge(me, n.then.accept(self), "then")
+            self._edge(me, (yield n.then), "then")
         if n.otherwise is not None:
-            self._edge(me, n.otherwise.accept(self), "else")
+            self._edge(me, (yield n.otherwise), "else")
         return me
 
-    def visit(self, n: ForStmt):
+    def _visit_ForStmt(self, n: ForStmt):
         me = self._new("For")
         if n.init is not None:
-            self._edge(me, n.init.accept(self), "init")
+            self._edge(me, (yield n.init), "init")
         if n.cond is not None:
-            self._edge(me, n.cond.accept(self), "cond")
+            self._edge(me, (yield n.cond), "cond")
         if n.step is not None:
-            self._edge(me, n.step.accept(self), "step")
+            self._edge(me, (yield n.step), "step")
         if n.body is not None:
-            self._edge(me, n.body.accept(self), "body")
+            self._edge(me, (yield n.body), "body")
         return me
 
-    def visit(self, n: WhileStmt):
+    def _visit_WhileStmt(self, n: WhileStmt):
         me = self._new("While")
         if n.cond is not None:
-            self._edge(me, n.cond.accept(self), "cond")
+            self._edge(me, (yield n.cond), "cond")
         if n.body is not None:
-            self._edge(me, n.body.accept(self), "body")
+            self._edge(me, (yield n.body), "body")
         return me
 
-    def visit(self, n: DoWhileStmt):
+    def _visit_DoWhileStmt(self, n: DoWhileStmt):
         me = self._new("DoWhile")
         if n.body is not None:
-            self._edge(me, n.body.accept(self), "body")
+            self._edge(me, (yield n.body), "body")
         if n.cond is not None:
-            self._edge(me, n.cond.accept(self), "cond")
+            self._edge(me, (yield n.cond), "cond")
         return me
 
     # ---- Expresiones ---------------------------------------------------------
-    def visit(self, n: Assign):
+    def _visit_Assign(self, n: Assign):
         me = self._new("=")
-        self._edge(me, n.target.accept(self), "target")
-        self._edge(me, n.value.accept(self), "value")
+        self._edge(me, (yield n.target), "target")
+        self._edge(me, (yield n.value), "value")
         return me
 
-    def visit(self, n: Identifier):
-        return self._new(f"Id({n.name})")
+    def _visit_Identifier(self, n: Identifier):
+        return self._leaf(f"Id({n.name})")
 
-    def visit(self, n: BinOper):
-        me = self._new(n.oper, shape="circle")
-        self._edge(me, n.left.accept(self))
-        self._edge(me, n.right.accept(self))
+    def _visit_BinOper(self, n: BinOper):
+        me = self._new(sys.intern(n.oper), shape="circle")
+        self._edge(me, (yield n.left))
+        self._edge(me, (yield n.right))
         return me
 
-    def visit(self, n: UnaryOper):
-        me = self._new(n.oper, shape="circle")
-        self._edge(me, n.expr.accept(self))
+    def _visit_UnaryOper(self, n: UnaryOper):
+        me = self._new(sys.intern(n.oper), shape="circle")
+        self._edge(me, (yield n.expr))
         return me
 
-    def visit(self, n: PostfixOper):
-        me = self._new(f"{n.oper}(post)", shape="circle")
-        self._edge(me, n.expr.accept(self))
+    def _visit_PostfixOper(self, n: PostfixOper):
+        me = self._new(_POSTFIX_LABELS.get(n.oper) or f"{n.oper}(post)", shape="circle")
+        self._edge(me, (yield n.expr))
         return me
 
-    def visit(self, n: PreInc):
+    def _visit_PreInc(self, n: PreInc):
         me = self._new("++(pre)", shape="circle")
-        self._edge(me, n.expr.accept(self))
+        self._edge(me, (yield n.expr))
         return me
 
-    def visit(self, n: PreDec):
+    def _visit_PreDec(self, n: PreDec):
         me = self._new("--(pre)", shape="circle")
-        self._edge(me, n.expr.accept(self))
+        self._edge(me, (yield n.expr))
         return me
 
-    def visit(self, n: Call):
+    def _visit_Call(self, n: Call):
         me = self._new("Call")
         if n.func is not None:
-            self._edge(me, n.func.accept(self), "func")
+            self._edge(me, (yield n.func), "func")
         if n.args:
             args_node = self._new("Args")
             self._edge(me, args_node)
             for a in n.args:
-                self._edge(args_node, a.accept(self))
+                self._edge(args_node, (yield a))
         return me
 
-    def visit(self, n: ArrayIndex):
+    def _visit_ArrayIndex(self, n: ArrayIndex):
         me = self._new("[]", shape="circle")
-        self._edge(me, n.array.accept(self), "array")
-        self._maybe_child(me, "index", n.index)
+        self._edge(me, (yield n.array), "array")
+        yield from self._maybe_child(me, "index", n.index)
         return me
 
-    def visit(self, n: Literal):
-        return self._new(f"{n.value}:{n.type}")
+    def _visit_Literal(self, n: Literal):
+        return self._leaf(f"{n.value}:{n.type}")
 
 # =============================================================================
 # 2) FORMATO “DEL PROFE”: AST -> texto
 # =============================================================================
 
+def _resolve_handler(handlers: dict, cls: type, fallback):
+    """Busca el handler de `cls` (o de su clase base más cercana) y lo memoriza."""
+    for klass in cls.__mro__[1:]:
+        if klass in handlers:
+            handlers[cls] = handlers[klass]
+            return handlers[klass]
+    handlers[cls] = fallback
+    return fallback
+
+
+# Sangrías de 4 espacios precalculadas (se extienden bajo demanda)
+_INDENT_CACHE: List[str] = [""]
+
+
+def ind(n: int) -> str:
+    while len(_INDENT_CACHE) <= n:
+        _INDENT_CACHE.append(_INDENT_CACHE[-1] + "    ")
+    return _INDENT_CACHE[n]
+
+
 def print_prof(root: Node) -> None:
     """Imprime el AST con el estilo requerido por tu profe."""
-    def ind(n): return "    " * n  # 4 espacios
+    # Todo se escribe en trozos sobre `out` y se une una sola vez al final
+    out: List[str] = []
+    w = out.append
+
     def q(s: str) -> str: return f"'{s}'"
 
+    def capture(emit, *args) -> str:
+        """Ejecuta un emisor sobre un buffer aparte y devuelve el texto."""
+        nonlocal w
+        saved, chunks = w, []
+        w = chunks.append
+        try:
+            emit(*args)
+        finally:
+            w = saved
+        return "".join(chunks)
+
     # --- helpers de tipos -----------------------------------------------------
     def _type_to_prof(t: Optional[Type]) -> str:
         if t is None:
@@ -244,217 +445,265 @@ def print_prof(root: Node) -> None:
     def _esc_string(s: str) -> str:
         return s.replace("\\", "\\\\").replace("\n", "\\n")
 
+    def emit_opt(emit, node, lvl: int) -> None:
+        """Escribe el nodo con el emisor dado, o 'None' si no hay nodo."""
+        if node:
+            emit(node, lvl)
+        else:
+            w("None")
+
+    def emit_list(items, emit, lvl: int) -> None:
+        """Escribe items separados por ', ' usando el emisor dado."""
+        first = True
+        for it in items:
+            if not first:
+                w(", ")
+            first = False
+            emit(it, lvl)
+
     # --- expresiones ----------------------------------------------------------
-    def emit_expr(e, lvl: int) -> str:
+    # Cada clase tiene su handler en una tabla; emit_expr hace un solo lookup
+    # por type(e) en lugar de recorrer la escalera de isinstance.
+    def _expr_bool(e, lvl): w("True" if e else "False")
+    def _expr_num(e, lvl): w(str(e))
+    def _expr_str(e, lvl): w(q(e))
+    def _expr_identifier(e, lvl): w(f"VarLoc(name={q(e.name)})")
+
+    def _expr_array_index(e, lvl):
+        base = e.array.name if isinstance(e.array, Identifier) else "<?>"
+        w(f"ArrayLoc(name={q(base)}, index=")
+        emit_expr(e.index, lvl)  # puede ser Node o primitivo
+        w(")")
+
+    def _expr_integer(e, lvl): w(f"Integer(value={e.value}, type='integer')")
+    def _expr_float(e, lvl): w(f"Float(value={e.value}, type='float')")
+
+    def _expr_boolean(e, lvl):
+        val = "True" if e.value else "False"
+        w(f"Boolean(value={val}, type='boolean')")
+
+    def _expr_char(e, lvl):
+        sv = _esc_char(e.value)
+        w(f"Char(value='{sv}', type='char')")
+
+    def _expr_string(e, lvl):
+        sv = _esc_string(e.value)
+        w(f"String(value={q(sv)}, type='string')")
+
+    def _expr_binoper(e, lvl):
+        w(f"BinOp(\n{ind(lvl+1)}oper={q(e.oper)},\n{ind(lvl+1)}left=")
+        emit_expr(e.left, lvl+1)
+        w(f",\n{ind(lvl+1)}right=")
+        emit_expr(e.right, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _expr_unaryoper(e, lvl):
+        w(f"UnaryOp(\n{ind(lvl+1)}oper={q(e.oper)},\n{ind(lvl+1)}expr=")
+        emit_expr(e.expr, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _expr_increment(e, lvl):
+        w("Increment(expr=")
+        emit_expr(e.expr, lvl)
+        w(")")
+
+    def _expr_decrement(e, lvl):
+        w("Decrement(expr=")
+        emit_expr(e.expr, lvl)
+        w(")")
+
+    def _expr_postfix(e, lvl):
+        if e.oper == "++":
+            _expr_increment(e, lvl)
+        elif e.oper == "--":
+            _expr_decrement(e, lvl)
+        else:
+            w("<?>")
+
+    def _expr_call(e, lvl):
+        fname = e.func.name if isinstance(e.func, Identifier) else "<?>"
+        w(f"FuncCall(name={q(fname)}, args=[")
+        emit_list(e.args or [], emit_expr, lvl)
+        w("])")
+
+    def _expr_unknown(e, lvl): w("<?>")
+
+    expr_handlers = {
         # Soporte para primitivos Python por si llegan “crudos”
-        if isinstance(e, bool):
-            return "True" if e else "False"
-        if isinstance(e, int):
-            return str(e)
-        if isinstance(e, float):
-            return str(e)
-        if isinstance(e, str):
-            return q(e)
-
-        if isinstance(e, Identifier):
-            return f"VarLoc(name={q(e.name)})"
-        if isinstance(e, ArrayIndex):
-            base = e.array.name if isinstance(e.array, Identifier) else "<?>"
-            idx = emit_expr(e.index, lvl)  # puede ser Node o primitivo
-            return f"ArrayLoc(name={q(base)}, index={idx})"
-        if isinstance(e, Integer):
-            return f"Integer(value={e.value}, type='integer')"
-        if isinstance(e, Float):
-            return f"Float(value={e.value}, type='float')"
-        if isinstance(e, Boolean):
-            val = "True" if e.value else "False"
-            return f"Boolean(value={val}, type='boolean')"
-        if isinstance(e, Char):
-            sv = _esc_char(e.value)
-            return f"Char(value='{sv}', type='char')"
-        if isinstance(e, String):
-            sv = _esc_string(e.value)
-            return f"String(value={q(sv)}, type='string')"
-        if isinstance(e, BinOper):
-            return (
-                "BinOp(\n"
-                f"{ind(lvl+1)}oper={q(e.oper)},\n"
-                f"{ind(lvl+1)}left={emit_expr(e.left, lvl+1)},\n"
-                f"{ind(lvl+1)}right={emit_expr(e.right, lvl+1)}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(e, UnaryOper):
-            return (
-                "UnaryOp(\n"
-                f"{ind(lvl+1)}oper={q(e.oper)},\n"
-                f"{ind(lvl+1)}expr={emit_expr(e.expr, lvl+1)}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(e, PreInc) or (isinstance(e, PostfixOper) and e.oper == "++"):
-            return f"Increment(expr={emit_expr(e.expr, lvl)})"
-        if isinstance(e, PreDec) or (isinstance(e, PostfixOper) and e.oper == "--"):
-            return f"Decrement(expr={emit_expr(e.expr, lvl)})"
-        if isinstance(e, Call):
-            fname = e.func.name if isinstance(e.func, Identifier) else "<?>"
-            args = ", ".join(emit_expr(a, lvl) for a in (e.args or []))
-            return f"FuncCall(name={q(fname)}, args=[{args}])"
-        return "<?>"
+        bool: _expr_bool, int: _expr_num, float: _expr_num, str: _expr_str,
+        Identifier: _expr_identifier, ArrayIndex: _expr_array_index,
+        Integer: _expr_integer, Float: _expr_float, Boolean: _expr_boolean,
+        Char: _expr_char, String: _expr_string,
+        BinOper: _expr_binoper, UnaryOper: _expr_unaryoper,
+        PreInc: _expr_increment, PreDec: _expr_decrement, PostfixOper: _expr_postfix,
+        Call: _expr_call,
+    }
+
+    def emit_expr(e, lvl: int) -> None:
+        handler = expr_handlers.get(type(e))
+        if handler is None:
+            handler = _resolve_handler(expr_handlers, type(e), _expr_unknown)
+        handler(e, lvl)
 
     # --- sentencias -----------------------------------------------------------
-    def emit_stmt(s: Node, lvl: int) -> str:
-        # NUEVO: manejar declaraciones dentro de bloques
-        if isinstance(s, VarDecl):
-            return emit_vardecl(s, lvl)
-
-        if isinstance(s, PrintStmt):
-            xs = ", ".join(emit_expr(a, lvl) for a in s.args) if s.args else ""
-            return f"PrintStmt(\n{ind(lvl+1)}exprs=[{xs}]\n{ind(lvl)})"
-        if isinstance(s, ReturnStmt):
-            if s.expr is None:
-                return "ReturnStmt(expr=None)"
-            return f"ReturnStmt(\n{ind(lvl+1)}expr={emit_expr(s.expr, lvl+1)}\n{ind(lvl)})"
-        if isinstance(s, Assign):
-            return (
-                "Assignment(\n"
-                f"{ind(lvl+1)}loc={emit_expr(s.target, lvl+1)},\n"
-                f"{ind(lvl+1)}expr={emit_expr(s.value, lvl+1)}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(s, IfStmt):
-            cond = emit_expr(s.cond, lvl+1) if s.cond else "None"
-            cons = emit_block_as_list(s.then, lvl+1)
-            alt  = emit_block_as_list(s.otherwise, lvl+1) if s.otherwise else "None"
-            return (
-                "IfStmt(\n"
-                f"{ind(lvl+1)}cond={cond},\n"
-                f"{ind(lvl+1)}cons={cons},\n"
-                f"{ind(lvl+1)}alt={alt}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(s, ForStmt):
-            init = emit_stmt(s.init, lvl+1) if s.init else "None"
-            cond = emit_expr(s.cond, lvl+1) if s.cond else "None"
-            post = emit_stmt(s.step, lvl+1) if s.step else "None"
-            body = emit_block_as_list(s.body, lvl+1)
-            return (
-                "ForStmt(\n"
-                f"{ind(lvl+1)}init={init},\n"
-                f"{ind(lvl+1)}cond={cond},\n"
-                f"{ind(lvl+1)}post={post},\n"
-                f"{ind(lvl+1)}body={body}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(s, WhileStmt):
-            cond = emit_expr(s.cond, lvl+1) if s.cond else "None"
-            body = emit_block_as_list(s.body, lvl+1)
-            return (
-                "WhileStmt(\n"
-                f"{ind(lvl+1)}cond={cond},\n"
-                f"{ind(lvl+1)}body={body}\n"
-                f"{ind(lvl)})"
-            )
-        if isinstance(s, DoWhileStmt):
-            body = emit_block_as_list(s.body, lvl+1)
-            cond = emit_expr(s.cond, lvl+1) if s.cond else "None"
-            return (
-                "DoWhileStmt(\n"
-                f"{ind(lvl+1)}body={body},\n"
-                f"{ind(lvl+1)}cond={cond}\n"
-                f"{ind(lvl)})"
-            )
+    def _stmt_print(s, lvl):
+        w(f"PrintStmt(\n{ind(lvl+1)}exprs=[")
+        if s.args:
+            emit_list(s.args, emit_expr, lvl)
+        w(f"]\n{ind(lvl)})")
+
+    def _stmt_return(s, lvl):
+        if s.expr is None:
+            w("ReturnStmt(expr=None)")
+            return
+        w(f"ReturnStmt(\n{ind(lvl+1)}expr=")
+        emit_expr(s.expr, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_assign(s, lvl):
+        w(f"Assignment(\n{ind(lvl+1)}loc=")
+        emit_expr(s.target, lvl+1)
+        w(f",\n{ind(lvl+1)}expr=")
+        emit_expr(s.value, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_if(s, lvl):
+        w(f"IfStmt(\n{ind(lvl+1)}cond=")
+        emit_opt(emit_expr, s.cond, lvl+1)
+        w(f",\n{ind(lvl+1)}cons=")
+        emit_block_as_list(s.then, lvl+1)
+        w(f",\n{ind(lvl+1)}alt=")
+        emit_opt(emit_block_as_list, s.otherwise, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_for(s, lvl):
+        w(f"ForStmt(\n{ind(lvl+1)}init=")
+        emit_opt(emit_stmt, s.init, lvl+1)
+        w(f",\n{ind(lvl+1)}cond=")
+        emit_opt(emit_expr, s.cond, lvl+1)
+        w(f",\n{ind(lvl+1)}post=")
+        emit_opt(emit_stmt, s.step, lvl+1)
+        w(f",\n{ind(lvl+1)}body=")
+        emit_block_as_list(s.body, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_while(s, lvl):
+        w(f"WhileStmt(\n{ind(lvl+1)}cond=")
+        emit_opt(emit_expr, s.cond, lvl+1)
+        w(f",\n{ind(lvl+1)}body=")
+        emit_block_as_list(s.body, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_dowhile(s, lvl):
+        w(f"DoWhileStmt(\n{ind(lvl+1)}body=")
+        emit_block_as_list(s.body, lvl+1)
+        w(f",\n{ind(lvl+1)}cond=")
+        emit_opt(emit_expr, s.cond, lvl+1)
+        w(f"\n{ind(lvl)})")
+
+    def _stmt_other(s, lvl):
         # expresión como sentencia (tu gramática lo permite)
         if hasattr(s, "accept") and not isinstance(s, (Block,)):
-            return emit_expr(s, lvl)
-        return "<?>"
+            emit_expr(s, lvl)
+        else:
+            w("<?>")
 
-    def emit_block_as_list(b: Optional[Block], lvl: int) -> str:
+    stmt_handlers = {
+        # NUEVO: manejar declaraciones dentro de bloques
+        VarDecl: lambda s, lvl: emit_vardecl(s, lvl),
+        PrintStmt: _stmt_print, ReturnStmt: _stmt_return, Assign: _stmt_assign,
+        IfStmt: _stmt_if, ForStmt: _stmt_for, WhileStmt: _stmt_while,
+        DoWhileStmt: _stmt_dowhile,
+    }
+
+    def emit_stmt(s: Node, lvl: int) -> None:
+        handler = stmt_handlers.get(type(s))
+        if handler is None:
+            handler = _resolve_handler(stmt_handlers, type(s), _stmt_other)
+        handler(s, lvl)
+
+    def emit_block_as_list(b: Optional[Block], lvl: int) -> None:
         if b is None:
-            return "[]"
-        lines = []
+            w("[]")
+            return
+        w("[\n")
+        first = True
         for st in b.stmts:
-            lines.append(ind(lvl) + emit_stmt(st, lvl))
-        inner = ",\n".join(lines)
-        return "[\n" + inner + "\n" + ind(lvl-1 if lvl>0 else 0) + "]"
+            if not first:
+                w(",\n")
+            first = False
+            w(ind(lvl))
+            emit_stmt(st, lvl)
+        w("\n" + ind(lvl-1 if lvl>0 else 0) + "]")
 
     # --- declaraciones --------------------------------------------------------
-    def emit_param(p: Param, lvl: int) -> str:
+    def emit_param(p: Param, lvl: int) -> None:
         if isinstance(p.type, ArrayType):
             base = _type_to_prof(p.type.base)
             size_txt = "None"
-            return f"ArrayParm(name={q(p.name)}, type={q(base)}, size={size_txt})"
+            w(f"ArrayParm(name={q(p.name)}, type={q(base)}, size={size_txt})")
         else:
             t = _type_to_prof(p.type)
-            return f"VarParm(name={q(p.name)}, type={q(t)})"
+            w(f"VarParm(name={q(p.name)}, type={q(t)})")
 
-    def emit_vardecl(v: VarDecl, lvl: int) -> str:
+    def emit_vardecl(v: VarDecl, lvl: int) -> None:
         # Función (VarDecl con FuncType + init Block) => FuncDecl
         if isinstance(v.type, FuncType):
             ret = _type_to_prof(v.type.ret)
-            parms = ", ".join(emit_param(p, lvl+2) for p in (v.type.params or []))
-            body = emit_block_as_list(v.init, lvl+2) if isinstance(v.init, Block) else "[]"
-            return (
-                "FuncDecl(\n"
-                f"{ind(lvl+1)}name={q(v.name)},\n"
-                f"{ind(lvl+1)}type={q(ret)},\n"
-                f"{ind(lvl+1)}parms=[{parms}],\n"
-                f"{ind(lvl+1)}body={body}\n"
-                f"{ind(lvl)})"
-            )
+            w(f"FuncDecl(\n{ind(lvl+1)}name={q(v.name)},\n{ind(lvl+1)}type={q(ret)},\n{ind(lvl+1)}parms=[")
+            emit_list(v.type.params or [], emit_param, lvl+2)
+            w(f"],\n{ind(lvl+1)}body=")
+            if isinstance(v.init, Block):
+                emit_block_as_list(v.init, lvl+2)
+            else:
+                w("[]")
+            w(f"\n{ind(lvl)})")
+            return
 
         # Arreglo
         if isinstance(v.type, ArrayType):
             base = _type_to_prof(v.type.base)
-            sizes = []
-            if v.type.size is None:
-                sizes = []
-            else:
-                sizes = [emit_expr(v.type.size, lvl+2)]
+            # El tamaño se imprime como lista de textos (repr de Python)
+            sizes = [] if v.type.size is None else [capture(emit_expr, v.type.size, lvl+2)]
+            w(f"ArrayDecl(\n{ind(lvl+1)}name={q(v.name)},\n{ind(lvl+1)}type={q(base)},\n"
+              f"{ind(lvl+1)}size={sizes},\n{ind(lvl+1)}value=")
             if v.init is None:
-                init_txt = "None"
+                w("None")
+            elif isinstance(v.init, Call) and isinstance(v.init.func, Identifier) and v.init.func.name == "array_init":
+                w("[")
+                emit_list(v.init.args, emit_expr, lvl+3)
+                w("]")
             else:
-                if isinstance(v.init, Call) and isinstance(v.init.func, Identifier) and v.init.func.name == "array_init":
-                    vals = ", ".join(emit_expr(a, lvl+3) for a in v.init.args)
-                    init_txt = "[" + vals + "]"
-                else:
-                    init_txt = emit_expr(v.init, lvl+2)
-            return (
-                "ArrayDecl(\n"
-                f"{ind(lvl+1)}name={q(v.name)},\n"
-                f"{ind(lvl+1)}type={q(base)},\n"
-                f"{ind(lvl+1)}size={[s for s in sizes] if sizes else []},\n"
-                f"{ind(lvl+1)}value={init_txt}\n"
-                f"{ind(lvl)})"
-            )
+                emit_expr(v.init, lvl+2)
+            w(f"\n{ind(lvl)})")
+            return
 
         # Variable simple
         t = _type_to_prof(v.type)
-        val = "None" if v.init is None else emit_expr(v.init, lvl+1)
-        return (
-            "VarDecl(\n"
-            f"{ind(lvl+1)}name={q(v.name)},\n"
-            f"{ind(lvl+1)}type={q(t)},\n"
-            f"{ind(lvl+1)}value={val}\n"
-            f"{ind(lvl)})"
-        )
+        w(f"VarDecl(\n{ind(lvl+1)}name={q(v.name)},\n{ind(lvl+1)}type={q(t)},\n{ind(lvl+1)}value=")
+        if v.init is None:
+            w("None")
+        else:
+            emit_expr(v.init, lvl+1)
+        w(f"\n{ind(lvl)})")
 
     # --- raíz -----------------------------------------------------------------
-    def emit_program(p: Program) -> str:
-        items = []
+    def emit_program(p: Program) -> None:
+        w(f"Program(\n{ind(1)}body=[\n")
+        first = True
         for node in p.body:
+            if not first:
+                w(",\n")
+            first = False
+            w(ind(2))
             if isinstance(node, VarDecl):
-                items.append(emit_vardecl(node, 2))
+                emit_vardecl(node, 2)
             else:
-                items.append(emit_stmt(node, 2))
-        inner = ",\n".join(ind(2) + s if not s.startswith(ind(2)) else s for s in items)
-        return (
-            "Program(\n"
-            f"{ind(1)}body=[\n"
-            f"{inner}\n"
-            f"{ind(1)}]\n"
-            ")"
-        )
+                emit_stmt(node, 2)
+        w(f"\n{ind(1)}]\n)\n")
 
-    print(emit_program(root))
+    emit_program(root)
+    sys.stdout.write("".join(out))
 
 
 # =============================================================================
@@ -480,11 +729,18 @@ if __name__ == "__main__":
     ap.add_argument("--out", default="AST", help="Nombre base de salida (sin extensión)")
     ap.add_argument("--format", default="png", choices=["png", "svg", "pdf"], help="Formato de imagen")
     ap.add_argument("--dot-only", action="store_true", help="Solo guardar el .dot (no renderizar imagen)")
+    ap.add_argument("--no-share-leaves", action="store_true",
+                    help="Un nodo por cada hoja (árbol) en vez de compartir hojas iguales")
+    ap.add_argument("--node-style", choices=["default", "compact"], default="default",
+                    help="compact = etiquetas de una línea (menos trabajo para dot)")
+    ap.add_argument("--style", choices=sorted(STYLE_PRESETS), default="purple",
+                    help="Colores/formas de nodos y aristas")
     ap.add_argument("--fmt", choices=["graphviz", "prof", "tree"], default="graphviz",
                     help="graphviz = .dot/img, prof = formato del profesor, tree = rich.Tree")
     args = ap.parse_args()
 
-    src = open(args.file, encoding="utf-8").read()
+    with open(args.file, "rb") as f:
+        src = f.read().decode("utf-8")
     ast = parse(src)
 
     if args.fmt == "prof":
@@ -492,10 +748,10 @@ if __name__ == "__main__":
     elif args.fmt == "tree":
         print_rich_tree(ast)
     else:
-        dot = ASTPrinter.render(ast)
+        dot = ASTPrinter.render(ast, share_leaves=not args.no_share_leaves,
+                                compact=args.node_style == "compact", style=args.style)
         dot_path = f"{args.out}.dot"
-        with open(dot_path, "w", encoding="utf-8") as f:
-            f.write(dot.source)
+        dot.save(dot_path)
         print(f"[green]Guardado {dot_path}")
         if not args.dot_only:
             out_path = dot.render(args.out, format=args.format, cleanup=True)
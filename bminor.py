@@ -1,46 +1,162 @@
 # bminor.py
-import argparse
+import hashlib
+import io
 import sys
 import os
-from pathlib import Path
+from collections import deque
+from contextlib import redirect_stdout
+from functools import lru_cache, partial
 
-# Tu lexer y parser
+# Tu lexer (lo usan todos los comandos). El parser, el checker, errors,
+# rich, astprint, pickle y el pool de procesos se importan dentro de cada
+# función que los necesita: así `scan` no paga su tiempo de import.
 import lexer
-from parser import Parser
 
-# Semántico
-try:
-    from checker import Check
-except Exception as e:
-    print("Error importando Check desde checker.py:", e)
-    print("Verifica que checker.py esté en la misma carpeta y que defina 'class Check' con método 'run'.")
-    sys.exit(1)
 
-# Errores
+# -------------------------------
+# Front-end con caché de AST
+# -------------------------------
+def _cache_dir() -> str:
+    # BMINOR_CACHE_DIR, o la caché de usuario (XDG): no ensucia las carpetas
+    # de fuentes y la comparten todas las copias de un mismo archivo
+    base = os.environ.get("BMINOR_CACHE_DIR")
+    if base:
+        return base
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg, "bminor")
+
+
+def read_source(filename) -> str:
+    # Una sola lectura binaria y un decode, sin pasar por TextIOWrapper.
+    # Los '\r' de CRLF se conservan: el lexer ya los ignora como espacio.
+    with open(filename, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def _lexer():
+    # Un solo Lexer por proceso: tokenize() reinicia texto, índice y línea
+    return lexer.Lexer()
+
+
+@lru_cache(maxsize=1)
+def _parser():
+    # Igual con el Parser: parse() arma sus pilas de nuevo en cada llamada
+    from parser import Parser
+    return Parser()
+
+
+@lru_cache(maxsize=1)
+def _front_end_version() -> str:
+    # Si cambia el lexer, el parser o los nodos, las entradas viejas no sirven
+    import model
+    import parser
+    parts = []
+    for mod in (lexer, parser, model):
+        st = os.stat(mod.__file__)
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return ":".join(parts)
+
+
+def _cache_path(raw: bytes) -> str:
+    # Clave por contenido: sobrevive a touch/checkout y a copias del archivo
+    h = hashlib.blake2b(raw, digest_size=16)
+    h.update(_front_end_version().encode())
+    return os.path.join(_cache_dir(), f"{h.hexdigest()}.ast.pkl")
+
+
+# Último parseo del proceso: (ruta en caché, pickle de (salida del lexer, AST)).
+# Si otro paso pide el mismo fuente (parse y luego check, p. ej.) no se vuelve
+# a leer la caché en disco ni a parsear. Se guarda el pickle y no el objeto
+# porque el checker anota los nodos (n.type) y cada paso espera un AST limpio.
+_last_parse = None
+
 
-from errors import clear_errors, errors_detected, set_source
+class _Tee:
+    """stdout que además guarda lo escrito; el resto se delega al original."""
 
-# (para --ast en parse)
-from rich.console import Console
-_console = Console()
+    def __init__(self, out):
+        self.out = out
+        self.log = []
 
-# Graphviz + formateadores de AST
-from astprint import ASTPrinter, print_prof, print_rich_tree
+    def write(self, s):
+        self.log.append(s)
+        return self.out.write(s)
+
+    def __getattr__(self, name):
+        return getattr(self.out, name)
+
+
+def parse_source(filename):
+    """
+    Lexea y parsea `filename` y devuelve el AST.
+    Si ya se parseó un fuente con el mismo contenido (y el mismo front-end),
+    el AST se carga del pickle en la caché de usuario sin lexear ni parsear. Los
+    mensajes del lexer se guardan junto al AST y se repiten en cada uso.
+    Llamar a clear_errors() antes; solo se cachean parseos sin errores.
+    """
+    global _last_parse
+    import pickle
+    from errors import errors_detected
+
+    with open(filename, "rb") as f:
+        raw = f.read()
+
+    cache = _cache_path(raw)
+    try:
+        if _last_parse is not None and _last_parse[0] == cache:
+            blob = _last_parse[1]
+        else:
+            with open(cache, "rb") as f:
+                blob = f.read()
+        lex_out, ast = pickle.loads(blob)
+    except Exception:
+        pass
+    else:
+        _last_parse = (cache, blob)
+        sys.stdout.write(lex_out)
+        return ast
+
+    src = raw.decode("utf-8")
+
+    # Los tokens fluyen del generador del lexer directo al parser, sin lista
+    # intermedia; lo que se imprima mientras tanto se copia para la caché
+    tee = _Tee(sys.stdout)
+    with redirect_stdout(tee):
+        ast = _parser().parse(_lexer().tokenize(src))
+    lex_out = "".join(tee.log)
+
+    if not errors_detected():
+        blob = pickle.dumps((lex_out, ast), protocol=pickle.HIGHEST_PROTOCOL)
+        _last_parse = (cache, blob)
+        tmp = f"{cache}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, cache)
+        except Exception:
+            # La caché es opcional: si no se puede escribir, se sigue sin ella
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return ast
 
 
 # -------------------------------
 # Escaneo (lexer)
 # -------------------------------
-def scan(filename):
+def scan(filename, _exists_checked=False):
     print(f" Escaneando archivo: {filename}")
-    if not os.path.exists(filename):
+    if not _exists_checked and not os.path.exists(filename):
         print(f"Error: el archivo {filename} no existe")
         sys.exit(1)
 
-    data = open(filename, encoding="utf-8").read()
+    data = read_source(filename)
     try:
-        tok_lex = lexer.Lexer()      # instancia del lexer
-        list(tok_lex.tokenize(data)) # fuerza el escaneo
+        tok_lex = _lexer()           # instancia del lexer (compartida)
+        deque(tok_lex.tokenize(data), maxlen=0)  # fuerza el escaneo sin guardar tokens
         print(" ✅ Sin errores léxicos.")
     except Exception as e:
         print(f"Error durante el escaneo: {e}")
@@ -61,22 +177,23 @@ def parse_file(
     gv_format="png",
     gv_dot_only=False,
     fmt=None,                 # (por compatibilidad; se ignora aquí)
+    gv_share_leaves=True,
+    gv_node_style="default",
+    gv_style="purple",
+    _exists_checked=False,    # True si el llamador ya sabe que el archivo existe
 ):
     print(f" Parseando archivo: {filename}")
-    if not os.path.exists(filename):
+    if not _exists_checked and not os.path.exists(filename):
         print(f"Error: el archivo {filename} no existe")
         sys.exit(1)
 
-    src = open(filename, encoding="utf-8").read()
-
-    # Tokenizar a lista para no consumir el generador
-    tok_lex = lexer.Lexer()
-    tokens = list(tok_lex.tokenize(src))
+    from errors import clear_errors, errors_detected
+    from rich.console import Console
+    console = Console()
 
     clear_errors()
-    par = Parser()
     try:
-        ast = par.parse(iter(tokens))
+        ast = parse_source(filename)
     except Exception as e:
         print(f"Error durante el parseo: {e}")
         sys.exit(1)
@@ -89,8 +206,8 @@ def parse_file(
 
     # ⬇️ SIEMPRE imprime el árbol en consola (rich.Tree)
     try:
-        _console.rule("[bold blue]AST (rich.Tree)[/bold blue]")
-        _console.print(ast.pretty())
+        console.rule("[bold blue]AST (rich.Tree)[/bold blue]")
+        console.print(ast.pretty())
     except AttributeError:
         print("⚠️  ast.pretty() no está disponible. "
               "Asegúrate de haber añadido pretty() en Node (model.py) "
@@ -100,9 +217,12 @@ def parse_file(
     if graph:
         astprint_file(
             filename,
-            out=gv_out or Path(filename).with_suffix("").name + "_AST",
+            out=gv_out or _default_out(filename),
             fmt=gv_format,
             dot_only=gv_dot_only,
+            share_leaves=gv_share_leaves,
+            node_style=gv_node_style,
+            style=gv_style,
             _ast_obj=ast,   # ya tenemos el AST, evitemos reparsear
         )
 
@@ -116,25 +236,34 @@ def parse_file(
 # -------------------------------
 # ASTPrinter como subcomando dedicado
 # -------------------------------
-def astprint_file(filename, out=None, fmt="png", dot_only=False, _ast_obj=None):
+def _default_out(filename) -> str:
+    # "dir/prog.bm" -> "prog_AST" (sin armar objetos Path)
+    return os.path.splitext(os.path.basename(filename))[0] + "_AST"
+
+
+def astprint_file(filename, out=None, fmt="png", dot_only=False, share_leaves=True,
+                  node_style="default", style="purple", _ast_obj=None, _exists_checked=False,
+                  _defer_render=False):
     """
     Genera el .dot y, salvo que dot_only sea True, también renderiza la imagen.
     Si _ast_obj viene ya construido (por parse_file), se reutiliza.
+    Con _defer_render no se llama a dot: se devuelve la ruta del .dot para que
+    process_path renderice todos los de la carpeta de una vez.
     """
     print(f" AST-Graphviz de: {filename}")
-    if not os.path.exists(filename):
-        print(f"Error: el archivo {filename} no existe")
-        sys.exit(1)
+    from astprint import ASTPrinter
 
-    # Si no recibimos el AST, parseamos aquí
+    # Si no recibimos el AST, parseamos aquí (con AST ya hecho no se toca
+    # el archivo: ni stat, ni lectura, ni tokenización)
     if _ast_obj is None:
-        src = open(filename, encoding="utf-8").read()
-        tok_lex = lexer.Lexer()
-        tokens = list(tok_lex.tokenize(src))
+        if not _exists_checked and not os.path.exists(filename):
+            print(f"Error: el archivo {filename} no existe")
+            sys.exit(1)
+
+        from errors import clear_errors, errors_detected
         clear_errors()
-        par = Parser()
         try:
-            _ast_obj = par.parse(iter(tokens))
+            _ast_obj = parse_source(filename)
         except Exception as e:
             print(f"Error durante el parseo: {e}")
             sys.exit(1)
@@ -143,16 +272,18 @@ def astprint_file(filename, out=None, fmt="png", dot_only=False, _ast_obj=None):
             # Puedes salir con error si lo prefieres:
             # sys.exit(1)
 
-    base = out or Path(filename).with_suffix("").name + "_AST"
+    base = out or _default_out(filename)
 
     try:
-        dot_obj = ASTPrinter.render(_ast_obj)
+        dot_obj = ASTPrinter.render(_ast_obj, share_leaves=share_leaves,
+                                    compact=node_style == "compact", style=style)
 
         dot_path = f"{base}.dot"
-        with open(dot_path, "w", encoding="utf-8") as f:
-            f.write(dot_obj.source)
+        dot_obj.save(dot_path)
         print(f" [green]Guardado[/green] {dot_path}")
 
+        if _defer_render:
+            return dot_path
         if not dot_only:
             out_path = dot_obj.render(base, format=fmt, cleanup=True)
             print(f" [green]Renderizado[/green] {out_path}")
@@ -165,29 +296,29 @@ def astprint_file(filename, out=None, fmt="png", dot_only=False, _ast_obj=None):
 # -------------------------------
 # Chequeo semántico
 # -------------------------------
-def check(filename, sym):
+def check(filename, sym, _exists_checked=False):
     print(f" Chequeando archivo: {filename}")
-    if not os.path.exists(filename):
+    if not _exists_checked and not os.path.exists(filename):
         print(f"Error: el archivo {filename} no existe")
         sys.exit(1)
 
-    # 1) Leer fuente
-    src = open(filename, encoding="utf-8").read()
-
-    # 2) Tokenizar a lista
+    # Semántico
     try:
-        tok_lex = lexer.Lexer()
-    except AttributeError:
-        print("Error: no se encontró lexer.Lexer()")
+        from checker import Check
+    except Exception as e:
+        print("Error importando Check desde checker.py:", e)
+        print("Verifica que checker.py esté en la misma carpeta y que defina 'class Check' con método 'run'.")
         sys.exit(1)
+    from errors import clear_errors, errors_detected
 
-    tokens = list(tok_lex.tokenize(src))
+    # 1-3) Leer, tokenizar y parsear a AST (o recuperarlo de la caché)
+    if not hasattr(lexer, "Lexer"):
+        print("Error: no se encontró lexer.Lexer()")
+        sys.exit(1)
 
-    # 3) Parsear a AST
     clear_errors()
     try:
-        par = Parser()
-        ast = par.parse(iter(tokens))
+        ast = parse_source(filename)
     except Exception as e:
         print(f"Error durante el parseo: {e}")
         sys.exit(1)
@@ -230,74 +361,158 @@ def codegen(filename):
 # -------------------------------
 # Procesa archivo o carpeta (no recursivo)
 # -------------------------------
+_SRC_SUFFIXES = frozenset({".bminor", ".bm"})
+
+
+# comando -> (función, ((parámetro, clave en kwargs, valor por defecto), ...))
+_DISPATCH = {
+    "scan": (scan, (
+        ("_exists_checked", "_exists_checked", False),
+    )),
+    "parse": (parse_file, (
+        ("dot", "dot", False),
+        ("png", "png", False),
+        ("ast_flag", "ast", False),
+        ("graph", "graph", False),
+        ("gv_out", "gv_out", None),
+        ("gv_format", "gv_format", "png"),
+        ("gv_dot_only", "gv_dot_only", False),
+        ("fmt", "fmt", None),
+        ("gv_share_leaves", "gv_share_leaves", True),
+        ("gv_node_style", "gv_node_style", "default"),
+        ("gv_style", "gv_style", "purple"),
+        ("_exists_checked", "_exists_checked", False),
+    )),
+    "astprint": (astprint_file, (
+        ("out", "gv_out", None),
+        ("fmt", "gv_format", "png"),
+        ("dot_only", "gv_dot_only", False),
+        ("share_leaves", "gv_share_leaves", True),
+        ("node_style", "gv_node_style", "default"),
+        ("style", "gv_style", "purple"),
+        ("_exists_checked", "_exists_checked", False),
+        ("_defer_render", "_defer_render", False),
+    )),
+    "check": (check, (
+        ("sym", "sym", False),
+        ("_exists_checked", "_exists_checked", False),
+    )),
+    "codegen": (codegen, ()),
+}
+
+
+def _run_command(command, filepath, kwargs):
+    fn, params = _DISPATCH[command]
+    base = kwargs.get("_gv_out_base")
+    if base:
+        # Carpeta con --gv-out: cada archivo escribe en "<base>_<nombre>",
+        # no todos en la misma ruta
+        kwargs = dict(kwargs, gv_out=f"{base}_{os.path.splitext(os.path.basename(filepath))[0]}")
+    return fn(filepath, **{p: kwargs.get(k, d) for p, k, d in params})
+
+
+class _CapturedOutput(io.StringIO):
+    # Buffer del worker que el padre reimprime en su terminal: se declara tty
+    # si la salida del padre lo es, así rich conserva colores y estilos
+    def __init__(self, tty):
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self):
+        return self._tty
+
+
+def _run_captured(command, kwargs, tty, filepath):
+    """
+    Corre un archivo en un proceso del pool. La salida se captura para que
+    el padre la imprima en orden y no se mezcle con la de otros archivos.
+    """
+    buf = _CapturedOutput(tty)
+    code = 0
+    result = None
+    with redirect_stdout(buf):
+        print(f"\n Encontrado archivo: {filepath}")
+        try:
+            result = _run_command(command, filepath, kwargs)
+        except SystemExit as e:
+            code = e.code
+    return buf.getvalue(), code, result
+
+
+def _render_pending(dot_paths, fmt):
+    if not dot_paths:
+        return
+    from astprint import render_dot_files
+    try:
+        for out_path in render_dot_files(dot_paths, format=fmt):
+            print(f" [green]Renderizado[/green] {out_path}")
+    except Exception as e:
+        print("⚠️  No se pudo renderizar con Graphviz.")
+        print("    Verifica que el ejecutable 'dot' esté en el PATH (dot -V).")
+        print(f"    Detalle: {e}")
+
+
 def process_path(command, path, **kwargs):
     def is_source(name: str) -> bool:
-        return name.endswith(".bminor") or name.endswith(".bm")
+        return os.path.splitext(name)[1] in _SRC_SUFFIXES
 
     if os.path.isdir(path):
-        for file in os.listdir(path):
-            if is_source(file):
-                filepath = os.path.join(path, file)
-                print(f"\n Encontrado archivo: {filepath}")
-                if command == "scan":
-                    scan(filepath)
-                elif command == "parse":
-                    parse_file(
-                        filepath,
-                        dot=kwargs.get("dot", False),
-                        png=kwargs.get("png", False),
-                        ast_flag=kwargs.get("ast", False),
-                        graph=kwargs.get("graph", False),
-                        gv_out=kwargs.get("gv_out", None),
-                        gv_format=kwargs.get("gv_format", "png"),
-                        gv_dot_only=kwargs.get("gv_dot_only", False),
-                        fmt=kwargs.get("fmt", None),
-                    )
-                elif command == "astprint":
-                    astprint_file(
-                        filepath,
-                        out=kwargs.get("gv_out", None),
-                        fmt=kwargs.get("gv_format", "png"),
-                        dot_only=kwargs.get("gv_dot_only", False),
-                    )
-                elif command == "check":
-                    check(filepath, kwargs.get("sym", False))
-                elif command == "codegen":
-                    codegen(filepath)
+        # scandir trae nombre y tipo en la misma lectura del directorio
+        with os.scandir(path) as it:
+            files = [e.path for e in it if is_source(e.name) and e.is_file()]
+        # scandir ya confirmó que son archivos: los comandos no repiten el stat.
+        # En astprint las imágenes se generan al final con un único `dot`.
+        defer = command == "astprint" and not kwargs.get("gv_dot_only", False)
+        kwargs = dict(kwargs, _exists_checked=True, _defer_render=defer,
+                      _gv_out_base=kwargs.get("gv_out"))
+        pending = []
+        try:
+            if len(files) < 2:
+                # Con 0 o 1 archivo no vale la pena levantar procesos
+                for filepath in files:
+                    print(f"\n Encontrado archivo: {filepath}")
+                    pending.append(_run_command(command, filepath, kwargs))
+                return
+
+            # Cada archivo es independiente: se reparten entre núcleos y los
+            # resultados se imprimen en el orden del directorio. Un envío por
+            # archivo, así ante el primer error se cancelan los que no
+            # empezaron (como el bucle secuencial, que se detenía ahí); solo
+            # terminan los que ya estaban corriendo.
+            work = partial(_run_captured, command, kwargs, sys.stdout.isatty())
+            workers = min(len(files), os.cpu_count() or 1)
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = [ex.submit(work, f) for f in files]
+                for fut in futures:
+                    out, code, result = fut.result()
+                    sys.stdout.write(out)
+                    if code:
+                        for rest in futures:
+                            rest.cancel()
+                        sys.exit(code)
+                    pending.append(result)
+        finally:
+            if defer:
+                _render_pending([p for p in pending if p], kwargs.get("gv_format", "png"))
     else:
         if not is_source(path):
             print("Advertencia: la ruta no parece .bm/.bminor; se intentará igual.")
-        if command == "scan":
-            scan(path)
-        elif command == "parse":
-            parse_file(
-                path,
-                dot=kwargs.get("dot", False),
-                png=kwargs.get("png", False),
-                ast_flag=kwargs.get("ast", False),
-                graph=kwargs.get("graph", False),
-                gv_out=kwargs.get("gv_out", None),
-                gv_format=kwargs.get("gv_format", "png"),
-                gv_dot_only=kwargs.get("gv_dot_only", False),
-                fmt=kwargs.get("fmt", None),
-            )
-        elif command == "astprint":
-            astprint_file(
-                path,
-                out=kwargs.get("gv_out", None),
-                fmt=kwargs.get("gv_format", "png"),
-                dot_only=kwargs.get("gv_dot_only", False),
-            )
-        elif command == "check":
-            check(path, kwargs.get("sym", False))
-        elif command == "codegen":
-            codegen(path)
+        _run_command(command, path, kwargs)
 
 
 # -------------------------------
 # CLI
 # -------------------------------
 def main():
+    # Atajo para la forma más común, `bminor <comando> <archivo>` sin flags:
+    # no hace falta construir argparse (los valores por defecto son los mismos)
+    argv = sys.argv
+    if len(argv) == 3 and argv[1] in _DISPATCH and not argv[2].startswith("-"):
+        process_path(argv[1], argv[2])
+        return
+
+    import argparse
     parser = argparse.ArgumentParser(description="Compilador bminor")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -324,6 +539,9 @@ def main():
     parse_parser.add_argument("--gv-out", default=None, help="Nombre base de salida para Graphviz (sin extensión)")
     parse_parser.add_argument("--gv-format", default="png", choices=["png", "svg", "pdf"], help="Formato de imagen")
     parse_parser.add_argument("--gv-dot-only", action="store_true", help="Solo guardar el .dot (no renderizar imagen)")
+    parse_parser.add_argument("--gv-no-share-leaves", action="store_true", help="No compartir nodos hoja iguales (árbol en vez de DAG)")
+    parse_parser.add_argument("--gv-node-style", default="default", choices=["default", "compact"], help="Estilo de etiquetas: compact = una sola línea")
+    parse_parser.add_argument("--gv-style", default="purple", choices=["purple", "blue"], help="Colores/formas de nodos y aristas")
 
     # astprint (subcomando dedicado)
     astprint_parser = subparsers.add_parser("astprint", help="Genera la imagen del AST con Graphviz")
@@ -331,6 +549,9 @@ def main():
     astprint_parser.add_argument("--gv-out", default=None, help="Nombre base de salida (sin extensión)")
     astprint_parser.add_argument("--gv-format", default="png", choices=["png", "svg", "pdf"], help="Formato de imagen")
     astprint_parser.add_argument("--gv-dot-only", action="store_true", help="Solo guardar el .dot (no renderizar imagen)")
+    astprint_parser.add_argument("--gv-no-share-leaves", action="store_true", help="No compartir nodos hoja iguales (árbol en vez de DAG)")
+    astprint_parser.add_argument("--gv-node-style", default="default", choices=["default", "compact"], help="Estilo de etiquetas: compact = una sola línea")
+    astprint_parser.add_argument("--gv-style", default="purple", choices=["purple", "blue"], help="Colores/formas de nodos y aristas")
 
     # check
     check_parser = subparsers.add_parser("check", help="Chequea el archivo fuente")
@@ -343,20 +564,19 @@ def main():
 
     args = parser.parse_args()
 
+    # Cada subcomando define solo sus flags: lo que falte toma el valor por defecto
+    opts = vars(args)
     process_path(
         args.command,
         args.file,
-        dot=getattr(args, "dot", False),
-        png=getattr(args, "png", False),
-        ast=getattr(args, "ast", False),
-        graph=getattr(args, "graph", False),
-        gv_out=getattr(args, "gv_out", None),
-        gv_format=getattr(args, "gv_format", "png"),
-        gv_dot_only=getattr(args, "gv_dot_only", False),
-        sym=getattr(args, "sym", False),
-        fmt=getattr(args, "fmt", None),   # <- pasa el formato elegido
+        **{k: opts.get(k, d) for k, d in (
+            ("dot", False), ("png", False), ("ast", False), ("graph", False),
+            ("gv_out", None), ("gv_format", "png"), ("gv_dot_only", False),
+            ("gv_node_style", "default"), ("gv_style", "purple"),
+            ("sym", False), ("fmt", None),
+        )},
+        gv_share_leaves=not opts.get("gv_no_share_leaves", False),
     )
 
-
 if __name__ == "__main__":
     main()
@@ -8,83 +8,59 @@ CORRECCIONES PRINCIPALES:
 3. Asignación correcta de board[curr_pos] = step en loops
 4. Condición correcta en is_valid_move (llamar a in_board)
 5. Manejo mejorado de arrays globales y locales
+
+RENDIMIENTO:
+El generador es código de intérprete, no de cálculo: el tiempo se va en el
+despacho por isinstance, las búsquedas en Scope, los f-strings y los
+append de IREmitter.emit. No hay bucles numéricos que vectorizar; lo que
+rinde es mover el código hacia abajo (compilarlo) y cambiar cómo se arman
+las líneas de IR y cómo se buscan los símbolos.
+Todo el front-end es Python puro, así que también corre con PyPy, cuyo JIT
+acelera justo este tipo de recorrido en archivos grandes:
+    pypy3 bminor2llvm.py archivo.bminor
+En CPython se puede compilar el módulo con mypyc: `mypy bminor2llvm.py` no
+da errores en este archivo y los nodos se importan estáticamente. Deja un
+.so al lado que se usa al importar el módulo (`python bminor2llvm.py`
+sigue corriendo el .py), así que la versión compilada se llama por import:
+    mypyc bminor2llvm.py
+    python -c "import sys, bminor2llvm; bminor2llvm.main(sys.argv[1:])" archivo.bminor
 """
 
 from __future__ import annotations
 import importlib
+import operator
+import re
 import sys
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
 # ===== Import dinámico =====
-def _import_mod(name: str):
+def _import_mod(name: str) -> Any:
     try:
         return importlib.import_module(name)
     except Exception as ex:
         print(f"; Aviso: no se pudo importar '{name}': {ex}", file=sys.stderr)
         return None
 
-parser_mod_name  = "parser"
-checker_mod_name = "checker"
-
-argv = sys.argv[1:]
-i = 0
-while i < len(argv):
-    if argv[i] == "--parser" and i + 1 < len(argv):
-        parser_mod_name = argv[i + 1]
-        argv.pop(i); argv.pop(i)
-        continue
-    if argv[i] == "--checker" and i + 1 < len(argv):
-        checker_mod_name = argv[i + 1]
-        argv.pop(i); argv.pop(i)
-        continue
-    i += 1
-
-if not argv:
-    sys.exit("Uso: python bminor2llvm.py archivo.bminor")
-
-filename = argv[0]
-
-parser_mod  = _import_mod(parser_mod_name)
-checker_mod = _import_mod(checker_mod_name)
-model_mod   = _import_mod("model")
-errors_mod  = _import_mod("errors")
-
-if parser_mod is None or not hasattr(parser_mod, "parse"):
-    sys.exit("Debes proveer un parser válido.")
-parse = getattr(parser_mod, "parse")
-check = getattr(checker_mod, "check", None) if checker_mod is not None else None
-
-# AST nodes
-Program       = getattr(model_mod, "Program")
-VarDecl       = getattr(model_mod, "VarDecl")
-Param         = getattr(model_mod, "Param")
-Block         = getattr(model_mod, "Block")
-PrintStmt     = getattr(model_mod, "PrintStmt")
-ReturnStmt    = getattr(model_mod, "ReturnStmt")
-IfStmt        = getattr(model_mod, "IfStmt")
-WhileStmt     = getattr(model_mod, "WhileStmt")
-DoWhileStmt   = getattr(model_mod, "DoWhileStmt")
-ForStmt       = getattr(model_mod, "ForStmt")
-Assign        = getattr(model_mod, "Assign")
-BinOper       = getattr(model_mod, "BinOper")
-UnaryOper     = getattr(model_mod, "UnaryOper")
-UnaryOp       = getattr(model_mod, "UnaryOp")  # ← AGREGAR ESTO
-PostfixOper   = getattr(model_mod, "PostfixOper")
-Identifier    = getattr(model_mod, "Identifier")
-Literal       = getattr(model_mod, "Literal")
-Integer       = getattr(model_mod, "Integer")
-Float         = getattr(model_mod, "Float")
-Boolean       = getattr(model_mod, "Boolean")
-Char          = getattr(model_mod, "Char")
-String        = getattr(model_mod, "String")
-ArrayIndex    = getattr(model_mod, "ArrayIndex")
-Call          = getattr(model_mod, "Call")
-SimpleType    = getattr(model_mod, "SimpleType")
-ArrayType     = getattr(model_mod, "ArrayType")
-FuncType      = getattr(model_mod, "FuncType")
-
-def set_source(fname: str, txt: str):
+errors_mod = _import_mod("errors")
+
+# AST nodes: import estático, así un compilador AOT (mypyc) ve las clases
+try:
+    from model import (
+        Node, Program, VarDecl, Block, PrintStmt, ReturnStmt, IfStmt,
+        WhileStmt, DoWhileStmt, ForStmt, Assign, BinOper, UnaryOper, UnaryOp,
+        PostfixOper, Identifier, Literal, Integer, Float, Boolean, Char, String,
+        ArrayIndex, Call, SimpleType, ArrayType, FuncType,
+    )
+except ImportError as ex:
+    # Solo "cannot import name 'X' from 'model'": model.py cargó pero le falta
+    # una clase. Si falta un módulo (model o una dependencia, p. ej.
+    # multimethod) el error original ya dice cuál y se deja pasar.
+    if isinstance(ex, ModuleNotFoundError) or ex.name != "model":
+        raise
+    falta = re.search(r"cannot import name '(\w+)'", str(ex))
+    sys.exit(f"model.py no define el nodo {falta.group(1) if falta else ex} que usa el generador")
+
+def set_source(fname: str, txt: str) -> None:
     if errors_mod is not None and hasattr(errors_mod, "set_source"):
         errors_mod.set_source(fname, txt)
 
@@ -94,91 +70,192 @@ def errors_detected() -> bool:
     return False
 
 # ===== IR Emitter =====
+# "%t0", "%t1", ...: nombres de temporales ya formateados. Crece por tandas y
+# lo comparten todos los emisores del proceso (p. ej. varios archivos seguidos)
+_TMP_NAMES: List[str] = []
+
 class IREmitter:
-    def __init__(self):
+    def __init__(self) -> None:
+        # Tres tramos que solo se juntan en finalize(): cabecera (declares y
+        # formatos), constantes de cadena (@.str.*, por nombre) y cuerpo.
+        # Nada se inserta en medio de una lista.
+        self.header_lines: List[str] = []
+        self.consts: Dict[str, str] = {}
         self.lines: List[str] = []
         self.tmp_counter = 0
         self.blk_counter = 0
+        # emit = append ya ligado: sin llamada a método extra por línea.
+        # emit_many agrega varias líneas seguidas con un solo extend.
+        self.emit = self.lines.append
+        self.emit_many = self.lines.extend
 
     def tmp(self) -> str:
         self.tmp_counter += 1
-        return f"%t{self.tmp_counter}"
+        n = self.tmp_counter
+        if n >= len(_TMP_NAMES):
+            _TMP_NAMES.extend(f"%t{i}" for i in range(len(_TMP_NAMES), n + 256))
+        return _TMP_NAMES[n]
 
     def label(self, base: str) -> str:
         self.blk_counter += 1
         return f"{base}{self.blk_counter}"
 
-    def emit(self, line: str):
-        self.lines.append(line)
-
-    def header(self):
-        self.emit('declare i32 @printf(i8*, ...)')
-        self.emit('declare i8* @malloc(i32)')
-        self.emit('')
-        self.emit('@.fmt_int   = private unnamed_addr constant [4 x i8] c"%d\\0A\\00"')
-        self.emit('@.fmt_float = private unnamed_addr constant [4 x i8] c"%f\\0A\\00"')
-        self.emit('@.fmt_char  = private unnamed_addr constant [4 x i8] c"%c\\0A\\00"')
-        self.emit('@.fmt_str   = private unnamed_addr constant [4 x i8] c"%s\\0A\\00"')
+    def header(self) -> None:
+        # noalias: cada malloc da memoria nueva, así LLVM sabe que dos
+        # arreglos dinámicos no se pisan y puede vectorizar sus bucles.
+        # printf solo lee el formato y ninguna de las dos lanza excepciones.
+        self.header_lines += [
+            'declare i32 @printf(i8* nocapture readonly, ...) nounwind',
+            'declare noalias i8* @malloc(i32) nounwind',
+            '',
+            '@.fmt_int   = private unnamed_addr constant [4 x i8] c"%d\\0A\\00"',
+            '@.fmt_float = private unnamed_addr constant [4 x i8] c"%f\\0A\\00"',
+            '@.fmt_char  = private unnamed_addr constant [4 x i8] c"%c\\0A\\00"',
+            '@.fmt_str   = private unnamed_addr constant [4 x i8] c"%s\\0A\\00"',
+        ]
         self.emit('')
 
     def finalize(self) -> str:
-        return "\n".join(self.lines) + "\n"
+        # La última constante registrada va primera, como cuando se insertaban
+        # una a una justo después de los formatos
+        return "\n".join([*self.header_lines, *reversed(self.consts.values()), *self.lines]) + "\n"
 
 # ===== Tipos =====
-LLVM_INT    = "i32"
-LLVM_BOOL   = "i1"
-LLVM_CHAR   = "i8"
-LLVM_FLOAT  = "double"
-LLVM_STRING = "i8*"
-
-def get_size(t) -> int:
-    llty = type_to_llvm(t)
-    if llty == LLVM_FLOAT: return 8
-    if llty == LLVM_INT or llty == LLVM_BOOL: return 4
-    if llty == LLVM_CHAR: return 1
-    return 4
-
-def type_to_llvm(t) -> str:
+# Internados: type_to_llvm siempre devuelve estos mismos objetos, así las
+# comparaciones `v.ty == LLVM_X` resuelven por identidad antes de mirar
+# caracteres. (No se usa `is`: algunos ty salen de recortar "[N x T]".)
+LLVM_INT    = sys.intern("i32")
+LLVM_BOOL   = sys.intern("i1")
+LLVM_CHAR   = sys.intern("i8")
+LLVM_FLOAT  = sys.intern("double")
+LLVM_STRING = sys.intern("i8*")
+
+# nombre de tipo B-Minor -> tipo LLVM. Los nombres con otras mayúsculas se
+# agregan la primera vez que aparecen: luego es un solo lookup por tipo.
+# (type_to_llvm/get_size son tablas sobre nodos del AST y strings: Numba no
+# sirve aquí, nopython no acepta estos objetos; si hace falta, mypyc.)
+_LLVM_TYPES: Dict[str, str] = {
+    "int": LLVM_INT, "integer": LLVM_INT,
+    "bool": LLVM_BOOL, "boolean": LLVM_BOOL,
+    "char": LLVM_CHAR,
+    "float": LLVM_FLOAT,
+    "string": LLVM_STRING,
+    "void": "void",
+}
+
+_LLVM_SIZES: Dict[str, int] = {LLVM_FLOAT: 8, LLVM_INT: 4, LLVM_BOOL: 4, LLVM_CHAR: 1}
+
+# Plantillas de operadores binarios: operador -> instrucción con huecos %s.
+# Un lookup y un % reemplazan la cadena de if/elif con un f-string por rama.
+_FLOAT_BINOPS: Dict[str, str] = {
+    op: f"  %s = {ins} double %s, %s"
+    for op, ins in (('+', 'fadd'), ('-', 'fsub'), ('*', 'fmul'), ('/', 'fdiv'))
+}
+_FLOAT_CMPS: Dict[str, str] = {
+    op: f"  %s = fcmp {cc} double %s, %s"
+    for op, cc in (('==', 'oeq'), ('!=', 'one'), ('<', 'olt'), ('<=', 'ole'), ('>', 'ogt'), ('>=', 'oge'))
+}
+_INT_BINOPS: Dict[str, str] = {
+    op: f"  %s = {ins} %s %s, %s"
+    # nsw: el desborde con signo queda indefinido, como en C; así LLVM puede
+    # razonar sobre los índices de los bucles (SCEV) y quitar chequeos
+    for op, ins in (('+', 'add nsw'), ('-', 'sub nsw'), ('*', 'mul nsw'), ('/', 'sdiv'), ('%', 'srem'))
+}
+_INT_CMPS: Dict[str, str] = {
+    op: f"  %s = icmp {cc} %s %s, %s"
+    for op, cc in (('==', 'eq'), ('!=', 'ne'), ('<', 'slt'), ('<=', 'sle'), ('>', 'sgt'), ('>=', 'sge'))
+}
+# && / ||: phi entre el valor fijo del cortocircuito y el lado derecho
+_LOGIC_OPS: Dict[str, str] = {
+    '&&': "  %s = phi i1 [ false, %%%s ], [ %s, %%%s ]",
+    '||': "  %s = phi i1 [ true, %%%s ], [ %s, %%%s ]",
+}
+
+def _sdiv(x: int, y: int) -> int:
+    # sdiv de LLVM trunca hacia cero; // de Python redondea hacia abajo
+    q = abs(x) // abs(y)
+    return q if (x < 0) == (y < 0) else -q
+
+# Plegado de constantes: operador -> función sobre dos enteros de Python
+_INT_FOLD: Dict[str, Callable[[int, int], int]] = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': _sdiv, '%': lambda x, y: x - _sdiv(x, y) * y,
+}
+_INT_CMP_FOLD: Dict[str, Callable[[int, int], bool]] = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt,
+    '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+def _fold_int(oper: str, a: str, b: str) -> Optional[ValueRef]:
+    """Evalúa `a oper b` si ambos son literales i32; None si no se puede."""
+    if not (a.lstrip('-').isdigit() and b.lstrip('-').isdigit()):
+        return None
+    x, y = int(a), int(b)
+    cmp = _INT_CMP_FOLD.get(oper)
+    if cmp is not None:
+        return ValueRef(LLVM_BOOL, "1" if cmp(x, y) else "0")
+    fn = _INT_FOLD.get(oper)
+    if fn is None or (y == 0 and oper in ('/', '%')):
+        return None
+    r = fn(x, y)
+    # Con desborde el resultado es poison (nsw): se deja para tiempo de ejecución
+    if not -2**31 <= r < 2**31:
+        return None
+    return ValueRef(LLVM_INT, str(r))
+
+def get_size(t: Any) -> int:
+    return _LLVM_SIZES.get(type_to_llvm(t), 4)
+
+def type_to_llvm(t: Any) -> str:
     if isinstance(t, SimpleType):
-        name = (t.name or "").lower()
+        name = t.name or ""
     elif isinstance(t, str):
-        name = t.lower()
+        name = t
     else:
-        name = None
-    if name in ("int", "integer"): return LLVM_INT
-    if name in ("bool", "boolean"): return LLVM_BOOL
-    if name == "char": return LLVM_CHAR
-    if name == "float": return LLVM_FLOAT
-    if name == "string": return LLVM_STRING
-    if name == "void": return "void"
-    return LLVM_INT
-
-def param_type_to_llvm(t) -> str:
+        return LLVM_INT
+    llty = _LLVM_TYPES.get(name)
+    if llty is None:
+        llty = _LLVM_TYPES[name] = _LLVM_TYPES.get(name.lower(), LLVM_INT)
+    return llty
+
+def param_type_to_llvm(t: Any) -> str:
     if isinstance(t, ArrayType):
         return f"{type_to_llvm(t.base)}*"
     return type_to_llvm(t)
 
-@dataclass
 class ValueRef:
-    ty: str
-    name: str
+    # Uno por temporal: con __slots__ no carga un __dict__ por instancia.
+    # Clase simple y no dataclass: dataclass(slots=True) pide Python 3.10, y
+    # mypyc no acepta una dataclass con __slots__ escritos a mano.
+    __slots__ = ("ty", "name")
+    def __init__(self, ty: str, name: str) -> None:
+        self.ty = ty
+        self.name = name
+    def __repr__(self) -> str:
+        return f"ValueRef(ty={self.ty!r}, name={self.name!r})"
 
 class Scope:
-    def __init__(self, parent: Optional["Scope"]=None):
+    # Cada scope ve los nombres del padre en un solo dict: la búsqueda es un
+    # dict.get, sin subir por la cadena. El dict del padre se comparte hasta
+    # la primera declaración propia (recién ahí se copia), así los bloques de
+    # if/while sin declaraciones no copian nada. Es seguro porque el codegen
+    # es anidado: el padre no declara nada mientras vive el hijo.
+    __slots__ = ("parent", "vars", "_own")
+    def __init__(self, parent: Optional["Scope"]=None) -> None:
         self.parent = parent
-        self.vars: Dict[str, ValueRef] = {}
+        self.vars: Dict[str, ValueRef] = parent.vars if parent is not None else {}
+        self._own = parent is None
     def get(self, name: str) -> Optional[ValueRef]:
-        if name in self.vars:
-            return self.vars[name]
-        if self.parent:
-            return self.parent.get(name)
-        return None
-    def set(self, name: str, val: ValueRef):
+        return self.vars.get(name)
+    def set(self, name: str, val: ValueRef) -> None:
+        if not self._own:
+            self.vars = dict(self.vars)
+            self._own = True
         self.vars[name] = val
 
 # ===== Codegen =====
 class Codegen:
-    def __init__(self, emitter: IREmitter):
+    def __init__(self, emitter: IREmitter) -> None:
         self.ir = emitter
         self.globals: Dict[str, Tuple[str, str]] = {}
         self.fn_ret_ty: Optional[str] = None
@@ -189,8 +266,10 @@ class Codegen:
         self.cur_fn_params: List[str] = []
         self.fn_sigs: Dict[str, Tuple[str, List[str]]] = {}
         self.arr_len: Dict[str, ValueRef] = {}
+        self._str_pool: Dict[str, Tuple[str, str]] = {}   # literal -> (@.str.N, "[N x i8]")
+        self._allocas: List[str] = []   # alloca de la función en curso
 
-    def gen_program(self, prog: Program):
+    def gen_program(self, prog: Program) -> None:
         self.ir.header()
         
         # Recolectar firmas
@@ -210,7 +289,7 @@ class Codegen:
             if isinstance(s, VarDecl) and isinstance(s.type, FuncType):
                 self._gen_function(s)
 
-    def _gen_global_decl(self, d: VarDecl):
+    def _gen_global_decl(self, d: VarDecl) -> None:
         """Genera la declaración y posible inicialización de una variable global."""
         ty = d.type
         
@@ -224,15 +303,17 @@ class Codegen:
                 self.globals[d.name] = (f"[{n} x {base_llty}]", gname)
                 
                 # Procesar inicializador
+                # (d.init puede ser cualquiera de estas formas: se mira como Any)
+                init: Any = d.init
                 init_values = None
-                if hasattr(d.init, 'values'):
-                    init_values = d.init.values
-                elif isinstance(d.init, list):
-                    init_values = d.init
-                elif hasattr(d.init, 'elements'):
-                    init_values = d.init.elements
-                elif hasattr(d.init, 'items'):
-                    init_values = d.init.items
+                if hasattr(init, 'values'):
+                    init_values = init.values
+                elif isinstance(init, list):
+                    init_values = init
+                elif hasattr(init, 'elements'):
+                    init_values = init.elements
+                elif hasattr(init, 'items'):
+                    init_values = init.items
                 
                 # Generar inicializador
                 if init_values is not None:
@@ -275,49 +356,61 @@ class Codegen:
         init = "0"
         
         if isinstance(d.init, Literal):
+            # El literal no tiene por qué ser del tipo declarado: se convierte
+            value: Any = d.init.value
             if llty == LLVM_INT:
-                init = str(int(d.init.value))
+                init = str(int(value))
             elif llty == LLVM_BOOL:
-                init = "1" if bool(d.init.value) else "0"
+                init = "1" if bool(value) else "0"
             elif llty == LLVM_CHAR:
-                init = str(ord(d.init.value))
+                init = str(ord(value))
             elif llty == LLVM_FLOAT:
-                init = f"{float(d.init.value)}"
+                init = f"{float(value)}"
         
         self.ir.emit(f'{gname} = global {llty} {init}')
 
-    def _gen_function(self, fdecl: VarDecl):
-        ftype: FuncType = fdecl.type
+    def _gen_function(self, fdecl: VarDecl) -> None:
+        ftype = fdecl.type
+        assert isinstance(ftype, FuncType)
         ret_llty = type_to_llvm(ftype.ret) if ftype.ret else "void"
         self.fn_ret_ty = ret_llty
         fname = f"@{fdecl.name}"
         self.current_fn_name = fdecl.name
-        self.fn_param_index[fdecl.name] = { p.name: i for i, p in enumerate(ftype.params or []) }
+        params = ftype.params or []
+        self.fn_param_index[fdecl.name] = { p.name: i for i, p in enumerate(params) }
         self.cur_fn_name = fdecl.name
-        self.cur_fn_params = [p.name for p in (ftype.params or [])]
+        self.cur_fn_params = [p.name for p in params]
 
-        params_sig = []
-        for p in (ftype.params or []):
-            p_llty = param_type_to_llvm(p.type)
-            params_sig.append(f"{p_llty} %{p.name}")
+        p_lltys = [param_type_to_llvm(p.type) for p in params]
+        params_sig = [f"{p_llty} %{p.name}" for p, p_llty in zip(params, p_lltys)]
 
         self.ir.emit(f"define {ret_llty} {fname}({', '.join(params_sig)}) "+"{")
         fn_scope = Scope()
 
-        for p in (ftype.params or []):
-            p_llty = param_type_to_llvm(p.type)
-            slot = self.ir.tmp()
-            self.ir.emit(f"  {slot} = alloca {p_llty}")
-            self.ir.emit(f"  store {p_llty} %{p.name}, {p_llty}* {slot}")
+        # Todos los alloca de la función (parámetros y locales, también los
+        # declarados dentro de un bucle) van juntos al inicio del bloque de
+        # entrada: una sola reserva de pila por llamada, y mem2reg los pasa a
+        # registros con sus phi, cosa que solo hace con los alloca de entrada.
+        # Se reserva una línea y se llena al cerrar la función.
+        entry_at = len(self.ir.lines)
+        self.ir.emit("")
+        self._allocas = []
+
+        # Prólogo (store por parámetro) armado aparte y emitido de una vez
+        prologue = []
+        for p, p_llty in zip(params, p_lltys):
+            slot = self._alloca(p_llty)
+            prologue.append(f"  store {p_llty} %{p.name}, {p_llty}* {slot}")
             fn_scope.set(p.name, ValueRef(ty=p_llty, name=slot))
+        if prologue:
+            self.ir.emit("\n".join(prologue))
 
         self.current_fn_end_label = self.ir.label("endfn.")
         if isinstance(fdecl.init, Block):
             self._gen_block(fdecl.init, fn_scope)
         
         # Agregar branch incondicional al label final (por si no hay return explícito)
-        self.ir.emit(f"  br label %{self.current_fn_end_label}")
-        self.ir.emit(f"{self.current_fn_end_label}:")
+        self.ir.emit_many((f"  br label %{self.current_fn_end_label}", f"{self.current_fn_end_label}:"))
         if ret_llty == "void":
             self.ir.emit("  ret void")
         else:
@@ -325,6 +418,10 @@ class Codegen:
 
         self.ir.emit("}")
         self.ir.emit("")  # Línea en blanco entre funciones
+        if self._allocas:
+            self.ir.lines[entry_at] = "\n".join(self._allocas)
+        else:
+            del self.ir.lines[entry_at]
         
         self.fn_ret_ty = None
         self.current_fn_end_label = None
@@ -332,35 +429,81 @@ class Codegen:
         self.cur_fn_name = None
         self.cur_fn_params = []
 
-    def _gen_block(self, block: Block, scope: Scope):
+    # ---- despacho ----
+    # type(nodo) -> método; las tablas se llenan al final de la clase y las
+    # subclases se resuelven una vez por el MRO y quedan cacheadas. Las clases
+    # sin entrada también: se guarda el método por defecto (una expresión
+    # usada como sentencia, o el 0 de una expresión desconocida).
+    _stmt_dispatch: ClassVar[Dict[type, Callable[..., Any]]] = {}
+    _expr_dispatch: ClassVar[Dict[type, Callable[..., ValueRef]]] = {}
+
+    @staticmethod
+    def _resolve(table: Dict[type, Callable[..., Any]], cls: type,
+                 default: Callable[..., Any]) -> Callable[..., Any]:
+        gen = default
+        for base in cls.__mro__[1:]:
+            if base in table:
+                gen = table[base]
+                break
+        table[cls] = gen
+        return gen
+
+    def _gen_expr_stmt(self, s: Node, scope: Scope) -> None:
+        # Assign, Call, PostfixOper...: sentencia que es una expresión
+        self._gen_expr(s, scope)
+
+    def _gen_unknown_expr(self, e: Optional[Node], scope: Scope) -> ValueRef:
+        return ValueRef(LLVM_INT, "0")
+
+    def _gen_block(self, block: Block, scope: Scope) -> None:
+        # Lo que no cambia dentro del bucle, en locales
+        lookup = self._stmt_dispatch.get
+        resolve = self._resolve
+        table = self._stmt_dispatch
+        expr_stmt = Codegen._gen_expr_stmt
         for s in block.stmts:
-            if isinstance(s, VarDecl) and not isinstance(s.type, FuncType):
-                self._gen_local_vardecl(s, scope)
-            elif isinstance(s, PrintStmt):
-                for a in s.args:
-                    v = self._gen_expr(a, scope)
-                    self._gen_print(v)
-            elif isinstance(s, ReturnStmt):
-                if s.expr is None:
-                    self.ir.emit(f"  br label %{self.current_fn_end_label}")
-                else:
-                    v = self._gen_expr(s.expr, scope)
-                    self.ir.emit(f"  ret {v.ty} {v.name}")
-                return
-            elif isinstance(s, IfStmt):
-                self._gen_if(s, scope)
-            elif isinstance(s, WhileStmt):
-                self._gen_while(s, scope)
-            elif isinstance(s, DoWhileStmt):
-                self._gen_dowhile(s, scope)
-            elif isinstance(s, ForStmt):
-                self._gen_for(s, scope)
-            elif isinstance(s, Block):
-                self._gen_block(s, Scope(scope))
-            else:
-                _ = self._gen_expr(s, scope)
+            t = type(s)
+            gen = lookup(t) or resolve(table, t, expr_stmt)
+            if gen(self, s, scope):
+                return      # return: el resto del bloque no se genera
+
+    def _gen_body(self, body: Node, scope: Scope) -> None:
+        # Cuerpo de if/while/for: bloque, o una sola sentencia que se despacha
+        # directo (sin envolverla en un Block nuevo)
+        if isinstance(body, Block):
+            self._gen_block(body, scope)
+            return
+        t = type(body)
+        gen = self._stmt_dispatch.get(t) or self._resolve(self._stmt_dispatch, t, Codegen._gen_expr_stmt)
+        gen(self, body, scope)
+
+    def _gen_vardecl_stmt(self, s: VarDecl, scope: Scope) -> None:
+        if not isinstance(s.type, FuncType):
+            self._gen_local_vardecl(s, scope)
+
+    def _gen_print_stmt(self, s: PrintStmt, scope: Scope) -> None:
+        for a in s.args:
+            v = self._gen_expr(a, scope)
+            self._gen_print(v)
+
+    def _gen_return(self, s: ReturnStmt, scope: Scope) -> bool:
+        if s.expr is None:
+            self.ir.emit(f"  br label %{self.current_fn_end_label}")
+        else:
+            v = self._gen_expr(s.expr, scope)
+            self.ir.emit(f"  ret {v.ty} {v.name}")
+        return True
+
+    def _gen_nested_block(self, s: Block, scope: Scope) -> None:
+        self._gen_block(s, Scope(scope))
+
+    def _alloca(self, llty: str) -> str:
+        # Reserva un slot en el bloque de entrada de la función en curso
+        slot = self.ir.tmp()
+        self._allocas.append(f"  {slot} = alloca {llty}")
+        return slot
 
-    def _gen_local_vardecl(self, d: VarDecl, scope: Scope):
+    def _gen_local_vardecl(self, d: VarDecl, scope: Scope) -> None:
         if isinstance(d.type, ArrayType):
             base_llty = type_to_llvm(d.type.base)
             elem_sz = get_size(d.type.base)
@@ -368,24 +511,22 @@ class Codegen:
             # Array estático [N x T]
             if d.type.size and isinstance(d.type.size, Integer):
                 n = int(d.type.size.value)
-                slot_arr = self.ir.tmp()
-                self.ir.emit(f"  {slot_arr} = alloca [{n} x {base_llty}]")
+                slot_arr = self._alloca(f"[{n} x {base_llty}]")
                 scope.set(d.name, ValueRef(ty=f"[{n} x {base_llty}]", name=slot_arr))
                 self.arr_len[d.name] = ValueRef(LLVM_INT, str(n))
                 return
 
             # Array dinámica
-            slot_ptr = self.ir.tmp()
-            self.ir.emit(f"  {slot_ptr} = alloca {base_llty}*")
+            slot_ptr = self._alloca(f"{base_llty}*")
             
             n_reg = "0"
             if d.type.size is not None:
                 nval = self._gen_expr(d.type.size, scope)
-                if nval.ty != LLVM_INT:
+                if nval.ty in (LLVM_BOOL, LLVM_CHAR):
+                    nval = ValueRef(LLVM_INT, self._zext_i32(nval))
+                elif nval.ty != LLVM_INT:
                     fix = self.ir.tmp()
-                    if nval.ty in (LLVM_BOOL, LLVM_CHAR):
-                        self.ir.emit(f"  {fix} = zext {nval.ty} {nval.name} to i32")
-                    elif nval.ty == LLVM_FLOAT:
+                    if nval.ty == LLVM_FLOAT:
                         self.ir.emit(f"  {fix} = fptosi double {nval.name} to i32")
                     else:
                         self.ir.emit(f"  {fix} = add i32 0, 0")
@@ -396,46 +537,55 @@ class Codegen:
             if n_reg == "0":
                 n_reg = "64"
             
+            # malloc + bitcast + store del puntero y slot con la longitud: un solo emit
             bytes_cnt = self.ir.tmp()
-            self.ir.emit(f"  {bytes_cnt} = mul i32 {n_reg}, {elem_sz}")
-            
             raw = self.ir.tmp()
-            self.ir.emit(f"  {raw} = call i8* @malloc(i32 {bytes_cnt})")
             cast = self.ir.tmp()
-            self.ir.emit(f"  {cast} = bitcast i8* {raw} to {base_llty}*")
-            self.ir.emit(f"  store {base_llty}* {cast}, {base_llty}** {slot_ptr}")
-            
-            len_slot = self.ir.tmp()
-            self.ir.emit(f"  {len_slot} = alloca i32")
-            self.ir.emit(f"  store i32 {n_reg}, i32* {len_slot}")
+            len_slot = self._alloca(LLVM_INT)
+            self.ir.emit(
+                f"  {bytes_cnt} = mul i32 {n_reg}, {elem_sz}\n"
+                f"  {raw} = call i8* @malloc(i32 {bytes_cnt})\n"
+                f"  {cast} = bitcast i8* {raw} to {base_llty}*\n"
+                f"  store {base_llty}* {cast}, {base_llty}** {slot_ptr}\n"
+                f"  store i32 {n_reg}, i32* {len_slot}"
+            )
             self.arr_len[d.name] = ValueRef(f"{LLVM_INT}*", len_slot)
             scope.set(d.name, ValueRef(ty=f"{base_llty}*", name=slot_ptr))
 
             init_values = getattr(d.init, "values", None)
             if init_values is not None:
-                arr_ptr = self.ir.tmp()
-                self.ir.emit(f"  {arr_ptr} = load {base_llty}*, {base_llty}** {slot_ptr}")
+                emit, new_tmp, gen_expr = self.ir.emit, self.ir.tmp, self._gen_expr
+                arr_ptr = new_tmp()
+                emit(f"  {arr_ptr} = load {base_llty}*, {base_llty}** {slot_ptr}")
+                # Lo fijo de cada elemento se formatea una vez por arreglo
+                gep_tpl = f"  {{}} = getelementptr inbounds {base_llty}, {base_llty}* {arr_ptr}, i32 {{}}".format
+                store_tpl = f"  store {base_llty} {{}}, {base_llty}* {{}}".format
+                gep_store_tpl = (
+                    f"  {{0}} = getelementptr inbounds {base_llty}, {base_llty}* {arr_ptr}, i32 {{1}}\n"
+                    f"  store {base_llty} {{2}}, {base_llty}* {{0}}"
+                ).format
                 for idx, elt in enumerate(init_values):
-                    val = self._gen_expr(elt, scope)
-                    gep = self.ir.tmp()
-                    self.ir.emit(f"  {gep} = getelementptr inbounds {base_llty}, {base_llty}* {arr_ptr}, i32 {idx}")
-                    castv = val.name
-                    if val.ty != base_llty:
-                        tmp = self.ir.tmp()
-                        if val.ty in (LLVM_BOOL, LLVM_CHAR):
-                            self.ir.emit(f"  {tmp} = zext {val.ty} {val.name} to i32")
-                        elif val.ty == LLVM_FLOAT and base_llty == LLVM_INT:
-                            self.ir.emit(f"  {tmp} = fptosi double {val.name} to i32")
-                        else:
-                            self.ir.emit(f"  {tmp} = add i32 0, 0")
-                        castv = tmp
-                    self.ir.emit(f"  store {base_llty} {castv}, {base_llty}* {gep}")
+                    val = gen_expr(elt, scope)
+                    gep = new_tmp()
+                    if val.ty == base_llty:
+                        # Caso común: sin conversión, gep + store en un solo emit
+                        emit(gep_store_tpl(gep, idx, val.name))
+                        continue
+                    emit(gep_tpl(gep, idx))
+                    if val.ty in (LLVM_BOOL, LLVM_CHAR):
+                        emit(store_tpl(self._zext_i32(val), gep))
+                        continue
+                    tmp = new_tmp()
+                    if val.ty == LLVM_FLOAT and base_llty == LLVM_INT:
+                        emit(f"  {tmp} = fptosi double {val.name} to i32")
+                    else:
+                        emit(f"  {tmp} = add i32 0, 0")
+                    emit(store_tpl(tmp, gep))
             return
             
         # Variable escalar
         llty = type_to_llvm(d.type)
-        slot = self.ir.tmp()
-        self.ir.emit(f"  {slot} = alloca {llty}")
+        slot = self._alloca(llty)
         scope.set(d.name, ValueRef(llty, slot))
 
         if getattr(d, "init", None) is not None:
@@ -443,8 +593,7 @@ class Codegen:
             if v.ty != llty:
                 cast = v.name
                 if v.ty in (LLVM_BOOL, LLVM_CHAR) and llty == LLVM_INT:
-                    cast = self.ir.tmp()
-                    self.ir.emit(f"  {cast} = zext {v.ty} {v.name} to i32")
+                    cast = self._zext_i32(v)
                 elif v.ty == LLVM_FLOAT and llty == LLVM_INT:
                     cast = self.ir.tmp()
                     self.ir.emit(f"  {cast} = fptosi double {v.name} to i32")
@@ -453,6 +602,15 @@ class Codegen:
         else:
             self.ir.emit(f"  store {llty} 0, {llty}* {slot}")
 
+    def _zext_i32(self, v: ValueRef) -> str:
+        # i1/i8 -> i32. Un literal (true/false, 'c') ya es su propio valor en
+        # i32: se usa tal cual, sin zext que LLVM tenga que plegar después.
+        if v.name.isdigit():
+            return v.name
+        r = self.ir.tmp()
+        self.ir.emit(f"  {r} = zext {v.ty} {v.name} to i32")
+        return r
+
     def _as_i1(self, v: ValueRef) -> ValueRef:
         if v.ty == LLVM_BOOL:
             return v
@@ -466,48 +624,42 @@ class Codegen:
             return ValueRef(LLVM_BOOL, cmpv)
         return ValueRef(LLVM_BOOL, "true")
 
-    def _gen_if(self, n: IfStmt, scope: Scope):
+    def _gen_if(self, n: IfStmt, scope: Scope) -> None:
         cond = self._as_i1(self._gen_expr(n.cond, scope))
         thenL = self.ir.label("then.")
         elseL = self.ir.label("else.")
         endL  = self.ir.label("endif.")
-        self.ir.emit(f"  br i1 {cond.name}, label %{thenL}, label %{elseL}")
-        self.ir.emit(f"{thenL}:")
-        self._gen_block(n.then if isinstance(n.then, Block) else Block(stmts=[n.then]), Scope(scope))
-        self.ir.emit(f"  br label %{endL}")
-        self.ir.emit(f"{elseL}:")
+        # La condición de un if depende de los datos (búsquedas, filtros):
+        # !unpredictable evita que el backend convierta un select en salto.
+        # Los saltos de los bucles sí son predecibles y no lo llevan.
+        self.ir.emit_many((f"  br i1 {cond.name}, label %{thenL}, label %{elseL}, !unpredictable !{{}}", f"{thenL}:"))
+        self._gen_body(n.then, Scope(scope))
+        self.ir.emit_many((f"  br label %{endL}", f"{elseL}:"))
         if n.otherwise:
-            self._gen_block(n.otherwise if isinstance(n.otherwise, Block) else Block(stmts=[n.otherwise]), Scope(scope))
-        self.ir.emit(f"  br label %{endL}")
-        self.ir.emit(f"{endL}:")
+            self._gen_body(n.otherwise, Scope(scope))
+        self.ir.emit_many((f"  br label %{endL}", f"{endL}:"))
 
-    def _gen_while(self, n: WhileStmt, scope: Scope):
+    def _gen_while(self, n: WhileStmt, scope: Scope) -> None:
         head = self.ir.label("for.head.")
         body = self.ir.label("for.body.")
         end  = self.ir.label("for.end.")
-        self.ir.emit(f"  br label %{head}")
-        self.ir.emit(f"{head}:")
+        self.ir.emit_many((f"  br label %{head}", f"{head}:"))
         c = self._as_i1(self._gen_expr(n.cond, scope))
-        self.ir.emit(f"  br i1 {c.name}, label %{body}, label %{end}")
-        self.ir.emit(f"{body}:")
-        self._gen_block(n.body if isinstance(n.body, Block) else Block(stmts=[n.body]), Scope(scope))
-        self.ir.emit(f"  br label %{head}")
-        self.ir.emit(f"{end}:")
+        self.ir.emit_many((f"  br i1 {c.name}, label %{body}, label %{end}", f"{body}:"))
+        self._gen_body(n.body, Scope(scope))
+        self.ir.emit_many((f"  br label %{head}", f"{end}:"))
 
-    def _gen_dowhile(self, n: DoWhileStmt, scope: Scope):
+    def _gen_dowhile(self, n: DoWhileStmt, scope: Scope) -> None:
         bodyL = self.ir.label("do.body.")
         head  = self.ir.label("do.head.")
         end   = self.ir.label("do.end.")
-        self.ir.emit(f"  br label %{bodyL}")
-        self.ir.emit(f"{bodyL}:")
-        self._gen_block(n.body if isinstance(n.body, Block) else Block(stmts=[n.body]), Scope(scope))
-        self.ir.emit(f"  br label %{head}")
-        self.ir.emit(f"{head}:")
+        self.ir.emit_many((f"  br label %{bodyL}", f"{bodyL}:"))
+        self._gen_body(n.body, Scope(scope))
+        self.ir.emit_many((f"  br label %{head}", f"{head}:"))
         c = self._as_i1(self._gen_expr(n.cond, scope))
-        self.ir.emit(f"  br i1 {c.name}, label %{bodyL}, label %{end}")
-        self.ir.emit(f"{end}:")
+        self.ir.emit_many((f"  br i1 {c.name}, label %{bodyL}, label %{end}", f"{end}:"))
 
-    def _gen_for(self, n: ForStmt, scope: Scope):
+    def _gen_for(self, n: ForStmt, scope: Scope) -> None:
         init_scope = Scope(scope)
         if getattr(n, "init", None) is not None:
             _ = self._gen_expr(n.init, init_scope)
@@ -515,369 +667,410 @@ class Codegen:
         body = self.ir.label("for.body.")
         step = self.ir.label("for.step.")
         end  = self.ir.label("for.end.")
-        self.ir.emit(f"  br label %{head}")
-        self.ir.emit(f"{head}:")
+        self.ir.emit_many((f"  br label %{head}", f"{head}:"))
         cond = self._as_i1(self._gen_expr(n.cond, init_scope)) if getattr(n, "cond", None) is not None else ValueRef(LLVM_BOOL, "true")
-        self.ir.emit(f"  br i1 {cond.name}, label %{body}, label %{end}")
-        self.ir.emit(f"{body}:")
-        self._gen_block(n.body if isinstance(n.body, Block) else Block(stmts=[n.body]), Scope(init_scope))
-        self.ir.emit(f"  br label %{step}")
-        self.ir.emit(f"{step}:")
+        self.ir.emit_many((f"  br i1 {cond.name}, label %{body}, label %{end}", f"{body}:"))
+        self._gen_body(n.body, Scope(init_scope))
+        self.ir.emit_many((f"  br label %{step}", f"{step}:"))
         if getattr(n, "step", None) is not None:
             _ = self._gen_expr(n.step, init_scope)
-        self.ir.emit(f"  br label %{head}")
-        self.ir.emit(f"{end}:")
+        self.ir.emit_many((f"  br label %{head}", f"{end}:"))
 
-    def _gen_expr(self, e, scope: Scope) -> ValueRef:
-        # Literales
-        if isinstance(e, Integer):
+    def _gen_expr(self, e: Optional[Node], scope: Scope) -> ValueRef:
+        # Atajo para el nodo más común (índices, límites, constantes): ni
+        # tabla ni llamada extra. El resto va por el lookup por clase (None,
+        # una expresión ausente, cae en _gen_unknown_expr).
+        if type(e) is Integer:
             return ValueRef(LLVM_INT, str(int(e.value)))
-        if isinstance(e, Boolean):
-            return ValueRef(LLVM_BOOL, "1" if bool(e.value) else "0")
-        if isinstance(e, Char):
-            return ValueRef(LLVM_CHAR, str(ord(e.value)))
-        if isinstance(e, Float):
-            return ValueRef(LLVM_FLOAT, f"{float(e.value)}")
-        if isinstance(e, String):
-            gname = self._string_global(e.value)
-            ptr = self.ir.tmp()
-            strlen = len(e.value) + 1
-            self.ir.emit(f"  {ptr} = getelementptr inbounds [{strlen} x i8], [{strlen} x i8]* {gname}, i32 0, i32 0")
-            return ValueRef(LLVM_STRING, ptr)
-        
+        t = type(e)
+        gen = self._expr_dispatch.get(t) or self._resolve(self._expr_dispatch, t, Codegen._gen_unknown_expr)
+        return gen(self, e, scope)
+
+    def _gen_int(self, e: Integer, scope: Scope) -> ValueRef:
+        return ValueRef(LLVM_INT, str(int(e.value)))
+
+    def _gen_bool(self, e: Boolean, scope: Scope) -> ValueRef:
+        return ValueRef(LLVM_BOOL, "1" if bool(e.value) else "0")
+
+    def _gen_char(self, e: Char, scope: Scope) -> ValueRef:
+        return ValueRef(LLVM_CHAR, str(ord(e.value)))
+
+    def _gen_float(self, e: Float, scope: Scope) -> ValueRef:
+        return ValueRef(LLVM_FLOAT, f"{float(e.value)}")
+
+    def _gen_string(self, e: String, scope: Scope) -> ValueRef:
+        gname, arr_ty = self._string_global(e.value)
+        ptr = self.ir.tmp()
+        self.ir.emit(f"  {ptr} = getelementptr inbounds {arr_ty}, {arr_ty}* {gname}, i32 0, i32 0")
+        return ValueRef(LLVM_STRING, ptr)
+
+    def _gen_ident(self, e: Identifier, scope: Scope) -> ValueRef:
         # Identificador
-        if isinstance(e, Identifier):
-            v = scope.get(e.name)
-            if v is not None:
-                reg = self.ir.tmp()
-                self.ir.emit(f"  {reg} = load {v.ty}, {v.ty}* {v.name}")
-                return ValueRef(v.ty, reg)
-            if e.name in self.globals:
-                llty, g = self.globals[e.name]
-                reg = self.ir.tmp()
-                self.ir.emit(f"  {reg} = load {llty}, {llty}* {g}")
-                return ValueRef(llty, reg)
-            return ValueRef(LLVM_INT, "0")
+        v = scope.get(e.name)
+        if v is not None:
+            reg = self.ir.tmp()
+            self.ir.emit(f"  {reg} = load {v.ty}, {v.ty}* {v.name}")
+            return ValueRef(v.ty, reg)
+        glob = self.globals.get(e.name)
+        if glob is not None:
+            llty, g = glob
+            reg = self.ir.tmp()
+            self.ir.emit(f"  {reg} = load {llty}, {llty}* {g}")
+            return ValueRef(llty, reg)
+        return ValueRef(LLVM_INT, "0")
 
+    def _gen_assign(self, e: Assign, scope: Scope) -> ValueRef:
         # Asignación
-        if isinstance(e, Assign):
-            if isinstance(e.target, Identifier):
-                slot = scope.get(e.target.name)
-                if slot is None and e.target.name in self.globals:
-                    llty, g = self.globals[e.target.name]
-                    val = self._gen_expr(e.value, scope)
-                    self.ir.emit(f"  store {llty} {val.name}, {llty}* {g}")
-                    return val
-                elif slot is not None:
-                    val = self._gen_expr(e.value, scope)
-                    self.ir.emit(f"  store {slot.ty} {val.name}, {slot.ty}* {slot.name}")
-                    return val
+        if isinstance(e.target, Identifier):
+            slot = scope.get(e.target.name)
+            glob = self.globals.get(e.target.name) if slot is None else None
+            if glob is not None:
+                llty, g = glob
+                val = self._gen_expr(e.value, scope)
+                self.ir.emit(f"  store {llty} {val.name}, {llty}* {g}")
+                return val
+            elif slot is not None:
+                val = self._gen_expr(e.value, scope)
+                self.ir.emit(f"  store {slot.ty} {val.name}, {slot.ty}* {slot.name}")
+                return val
+        
+        # Asignación a array
+        elif isinstance(e.target, ArrayIndex):
+            idx_node = e.target
             
-            # Asignación a array
-            elif isinstance(e.target, ArrayIndex):
-                idx_node = e.target
-                
-                # Array global [N x T]
-                if isinstance(idx_node.array, Identifier) and idx_node.array.name in self.globals:
-                    gty, gname = self.globals[idx_node.array.name]
-                    if gty.startswith('['):
-                        elem_ty = gty.split(' x ')[-1].rstrip(']')
-                        idx = self._gen_expr(idx_node.index, scope)
-                        gep = self.ir.tmp()
-                        self.ir.emit(f"  {gep} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 {idx.name}")
-                        val = self._gen_expr(e.value, scope)
-                        castv = val.name
-                        if val.ty != elem_ty:
-                            tmp = self.ir.tmp()
-                            if val.ty in (LLVM_BOOL, LLVM_CHAR):
-                                self.ir.emit(f"  {tmp} = zext {val.ty} {val.name} to i32")
-                            elif val.ty == LLVM_FLOAT and elem_ty == LLVM_INT:
-                                self.ir.emit(f"  {tmp} = fptosi double {val.name} to i32")
-                            else:
-                                self.ir.emit(f"  {tmp} = add i32 0, 0")
-                            castv = tmp
-                        self.ir.emit(f"  store {elem_ty} {castv}, {elem_ty}* {gep}")
-                        return ValueRef(elem_ty, castv)
-                
-                # Array local [N x T]
-                v = scope.get(idx_node.array.name)
-                if v and v.ty.startswith('['):
-                    elem_ty = v.ty.split(' x ')[-1].rstrip(']')
+            # Array global [N x T]
+            glob = self.globals.get(idx_node.array.name) if isinstance(idx_node.array, Identifier) else None
+            if glob is not None:
+                gty, gname = glob
+                if gty.startswith('['):
+                    elem_ty = gty.split(' x ')[-1].rstrip(']')
                     idx = self._gen_expr(idx_node.index, scope)
                     gep = self.ir.tmp()
-                    self.ir.emit(f"  {gep} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 {idx.name}")
+                    self.ir.emit(f"  {gep} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 {idx.name}")
                     val = self._gen_expr(e.value, scope)
-                    self.ir.emit(f"  store {elem_ty} {val.name}, {elem_ty}* {gep}")
-                    return ValueRef(elem_ty, val.name)
-                
-                # Puntero T*
-                base_ptr, elem_ty = self._gen_array_ptr(idx_node, scope)
+                    castv = val.name
+                    if val.ty in (LLVM_BOOL, LLVM_CHAR) and val.ty != elem_ty:
+                        castv = self._zext_i32(val)
+                    elif val.ty != elem_ty:
+                        tmp = self.ir.tmp()
+                        if val.ty == LLVM_FLOAT and elem_ty == LLVM_INT:
+                            self.ir.emit(f"  {tmp} = fptosi double {val.name} to i32")
+                        else:
+                            self.ir.emit(f"  {tmp} = add i32 0, 0")
+                        castv = tmp
+                    self.ir.emit(f"  store {elem_ty} {castv}, {elem_ty}* {gep}")
+                    return ValueRef(elem_ty, castv)
+            
+            # Array local [N x T]
+            v = scope.get(idx_node.array.name) if isinstance(idx_node.array, Identifier) else None
+            if v and v.ty.startswith('['):
+                elem_ty = v.ty.split(' x ')[-1].rstrip(']')
                 idx = self._gen_expr(idx_node.index, scope)
                 gep = self.ir.tmp()
-                self.ir.emit(f"  {gep} = getelementptr inbounds {elem_ty}, {elem_ty}* {base_ptr}, i32 {idx.name}")
+                self.ir.emit(f"  {gep} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 {idx.name}")
                 val = self._gen_expr(e.value, scope)
                 self.ir.emit(f"  store {elem_ty} {val.name}, {elem_ty}* {gep}")
-                return val
+                return ValueRef(elem_ty, val.name)
             
-            return self._gen_expr(e.value, scope)
+            # Puntero T*
+            base_ptr, elem_ty = self._gen_array_ptr(idx_node, scope)
+            idx = self._gen_expr(idx_node.index, scope)
+            gep = self.ir.tmp()
+            self.ir.emit(f"  {gep} = getelementptr inbounds {elem_ty}, {elem_ty}* {base_ptr}, i32 {idx.name}")
+            val = self._gen_expr(e.value, scope)
+            self.ir.emit(f"  store {elem_ty} {val.name}, {elem_ty}* {gep}")
+            return val
+        
+        return self._gen_expr(e.value, scope)
 
+    def _gen_index(self, e: ArrayIndex, scope: Scope) -> ValueRef:
         # Acceso a array
-        if isinstance(e, ArrayIndex):
-            if isinstance(e.array, Identifier):
-                # Array global [N x T]
-                if e.array.name in self.globals:
-                    gty, gname = self.globals[e.array.name]
-                    if gty.startswith('['):
-                        T = gty.split(' x ')[-1].rstrip(']')
-                        idx = self._gen_expr(e.index, scope)
-                        gep = self.ir.tmp()
-                        self.ir.emit(f"  {gep} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 {idx.name}")
-                        reg = self.ir.tmp()
-                        self.ir.emit(f"  {reg} = load {T}, {T}* {gep}")
-                        return ValueRef(T, reg)
-                
-                # Array local [N x T]
-                v = scope.get(e.array.name)
-                if v and v.ty.startswith('['):
-                    T = v.ty.split(' x ')[-1].rstrip(']')
+        if isinstance(e.array, Identifier):
+            # Array global [N x T]
+            glob = self.globals.get(e.array.name)
+            if glob is not None:
+                gty, gname = glob
+                if gty.startswith('['):
+                    T = gty.split(' x ')[-1].rstrip(']')
                     idx = self._gen_expr(e.index, scope)
                     gep = self.ir.tmp()
-                    self.ir.emit(f"  {gep} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 {idx.name}")
                     reg = self.ir.tmp()
-                    self.ir.emit(f"  {reg} = load {T}, {T}* {gep}")
+                    self.ir.emit_many((
+                        f"  {gep} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 {idx.name}",
+                        f"  {reg} = load {T}, {T}* {gep}",
+                    ))
                     return ValueRef(T, reg)
-                
-                # Puntero T*
-                if v and v.ty.endswith('*'):
-                    baseT = v.ty[:-1]
-                    loaded = self.ir.tmp()
-                    self.ir.emit(f"  {loaded} = load {v.ty}, {v.ty}* {v.name}")
-                    idx = self._gen_expr(e.index, scope)
-                    gep = self.ir.tmp()
-                    self.ir.emit(f"  {gep} = getelementptr inbounds {baseT}, {baseT}* {loaded}, i32 {idx.name}")
-                    reg = self.ir.tmp()
-                    self.ir.emit(f"  {reg} = load {baseT}, {baseT}* {gep}")
-                    return ValueRef(baseT, reg)
+            
+            # Array local [N x T]
+            v = scope.get(e.array.name)
+            if v and v.ty.startswith('['):
+                T = v.ty.split(' x ')[-1].rstrip(']')
+                idx = self._gen_expr(e.index, scope)
+                gep = self.ir.tmp()
+                reg = self.ir.tmp()
+                self.ir.emit_many((
+                    f"  {gep} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 {idx.name}",
+                    f"  {reg} = load {T}, {T}* {gep}",
+                ))
+                return ValueRef(T, reg)
+            
+            # Puntero T*
+            if v and v.ty.endswith('*'):
+                baseT = v.ty[:-1]
+                loaded = self.ir.tmp()
+                self.ir.emit(f"  {loaded} = load {v.ty}, {v.ty}* {v.name}, !nonnull !{{}}")
+                idx = self._gen_expr(e.index, scope)
+                gep = self.ir.tmp()
+                reg = self.ir.tmp()
+                self.ir.emit_many((
+                    f"  {gep} = getelementptr inbounds {baseT}, {baseT}* {loaded}, i32 {idx.name}",
+                    f"  {reg} = load {baseT}, {baseT}* {gep}",
+                ))
+                return ValueRef(baseT, reg)
+        return ValueRef(LLVM_INT, "0")
 
+    def _gen_call(self, e: Call, scope: Scope) -> ValueRef:
         # Llamada a función
-        if isinstance(e, Call):
-            callee = e.func.name if isinstance(e.func, Identifier) else "unknown"
-            argvals: List[ValueRef] = []
-            
-            for a in e.args:
-                if isinstance(a, Identifier):
-                    v = scope.get(a.name)
-                    # Array local estático [N x T]
-                    if v and v.ty.startswith('['):
-                        ptr = self.ir.tmp()
-                        elem_ty = v.ty.split(' x ')[-1].rstrip(']')
-                        self.ir.emit(f"  {ptr} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 0")
-                        argvals.append(ValueRef(f"{elem_ty}*", ptr))
-                        continue
-                    # Array puntero T*
-                    if v and v.ty.endswith('*'):
-                        loaded_ptr = self.ir.tmp()
-                        self.ir.emit(f"  {loaded_ptr} = load {v.ty}, {v.ty}* {v.name}")
-                        argvals.append(ValueRef(v.ty, loaded_ptr))
+        callee = e.func.name if isinstance(e.func, Identifier) else "unknown"
+        argvals: List[ValueRef] = []
+        # Lo que se usa por argumento, en locales
+        emit, tmp = self.ir.emit, self.ir.tmp
+        get_var, get_glob = scope.get, self.globals.get
+        gen_expr, add_arg = self._gen_expr, argvals.append
+        
+        for a in e.args:
+            if isinstance(a, Identifier):
+                v = get_var(a.name)
+                # Array local estático [N x T]
+                if v and v.ty.startswith('['):
+                    ptr = tmp()
+                    elem_ty = v.ty.split(' x ')[-1].rstrip(']')
+                    emit(f"  {ptr} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 0")
+                    add_arg(ValueRef(f"{elem_ty}*", ptr))
+                    continue
+                # Array puntero T*
+                if v and v.ty.endswith('*'):
+                    loaded_ptr = tmp()
+                    emit(f"  {loaded_ptr} = load {v.ty}, {v.ty}* {v.name}")
+                    add_arg(ValueRef(v.ty, loaded_ptr))
+                    continue
+                # Array global [N x T]
+                glob = get_glob(a.name)
+                if glob is not None:
+                    gty, gname = glob
+                    if gty.startswith('['):
+                        ptr = tmp()
+                        elem_ty = gty.split(' x ')[-1].rstrip(']')
+                        emit(f"  {ptr} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 0")
+                        add_arg(ValueRef(f"{elem_ty}*", ptr))
                         continue
-                    # Array global [N x T]
-                    if a.name in self.globals:
-                        gty, gname = self.globals[a.name]
-                        if gty.startswith('['):
-                            ptr = self.ir.tmp()
-                            elem_ty = gty.split(' x ')[-1].rstrip(']')
-                            self.ir.emit(f"  {ptr} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 0")
-                            argvals.append(ValueRef(f"{elem_ty}*", ptr))
-                            continue
-                
-                argvals.append(self._gen_expr(a, scope))
+            
+            add_arg(gen_expr(a, scope))
 
-            if callee in self.fn_sigs:
-                ret_llty, param_lltys = self.fn_sigs[callee]
-                fname = f"@{callee}"
-                
-                call_args = []
-                for val_ref, sig_ty in zip(argvals, param_lltys):
-                    call_args.append(f"{sig_ty} {val_ref.name}")
-                
-                call_str = f"call {ret_llty} {fname}({', '.join(call_args)})"
-                
-                if ret_llty != "void":
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = {call_str}")
-                    return ValueRef(ret_llty, r)
-                else:
-                    self.ir.emit(f"  {call_str}")
-                    return ValueRef("void", "")
+        sig = self.fn_sigs.get(callee)
+        if sig is not None:
+            ret_llty, param_lltys = sig
+            call_args = ", ".join([f"{sig_ty} {val_ref.name}" for val_ref, sig_ty in zip(argvals, param_lltys)])
+            call_str = f"call {ret_llty} @{callee}({call_args})"
             
-            return ValueRef(LLVM_INT, "0")
+            if ret_llty != "void":
+                r = tmp()
+                emit(f"  {r} = {call_str}")
+                return ValueRef(ret_llty, r)
+            else:
+                emit(f"  {call_str}")
+                return ValueRef("void", "")
+        
+        return ValueRef(LLVM_INT, "0")
 
+    def _gen_unary(self, e: UnaryOper, scope: Scope) -> ValueRef:
         # Operador unario
-        if isinstance(e, UnaryOper):
-            v = self._gen_expr(e.expr, scope)
-            if e.oper == '-':
-                if v.ty == LLVM_FLOAT:
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = fsub double 0.0, {v.name}")
-                    return ValueRef(v.ty, r)
+        v = self._gen_expr(e.expr, scope)
+        if e.oper == '-':
+            if v.ty == LLVM_FLOAT:
                 r = self.ir.tmp()
-                self.ir.emit(f"  {r} = sub {v.ty} 0, {v.name}")
+                self.ir.emit(f"  {r} = fsub double 0.0, {v.name}")
                 return ValueRef(v.ty, r)
-            if e.oper == '+':
-                return v
-            if e.oper == '!' or e.oper == 'NOT':
-                as1 = self._as_i1(v)
-                r = self.ir.tmp()
-                self.ir.emit(f"  {r} = xor i1 {as1.name}, true")
-                return ValueRef(LLVM_BOOL, r)
+            r = self.ir.tmp()
+            self.ir.emit(f"  {r} = sub nsw {v.ty} 0, {v.name}")
+            return ValueRef(v.ty, r)
+        if e.oper == '+':
             return v
-        
+        if e.oper == '!' or e.oper == 'NOT':
+            as1 = self._as_i1(v)
+            r = self.ir.tmp()
+            self.ir.emit(f"  {r} = xor i1 {as1.name}, true")
+            return ValueRef(LLVM_BOOL, r)
+        return v
+
+    def _gen_unaryop(self, e: UnaryOp, scope: Scope) -> ValueRef:
         # Soporte adicional para UnaryOp (si el parser lo usa)
-        if isinstance(e, UnaryOp):
-            v = self._gen_expr(e.expr, scope)
-            if e.op == '!':
-                as1 = self._as_i1(v)
+        v = self._gen_expr(e.expr, scope)
+        if e.op == '!':
+            as1 = self._as_i1(v)
+            r = self.ir.tmp()
+            self.ir.emit(f"  {r} = xor i1 {as1.name}, true")
+            return ValueRef(LLVM_BOOL, r)
+        elif e.op == '-':
+            if v.ty == LLVM_FLOAT:
                 r = self.ir.tmp()
-                self.ir.emit(f"  {r} = xor i1 {as1.name}, true")
-                return ValueRef(LLVM_BOOL, r)
-            elif e.op == '-':
-                if v.ty == LLVM_FLOAT:
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = fsub double 0.0, {v.name}")
-                    return ValueRef(v.ty, r)
-                r = self.ir.tmp()
-                self.ir.emit(f"  {r} = sub {v.ty} 0, {v.name}")
+                self.ir.emit(f"  {r} = fsub double 0.0, {v.name}")
                 return ValueRef(v.ty, r)
-            return v
+            r = self.ir.tmp()
+            self.ir.emit(f"  {r} = sub nsw {v.ty} 0, {v.name}")
+            return ValueRef(v.ty, r)
+        return v
 
+    def _gen_postfix(self, e: PostfixOper, scope: Scope) -> ValueRef:
         # Operador postfijo (++/--)
-        if isinstance(e, PostfixOper):
-            if isinstance(e.expr, Identifier):
-                slot = scope.get(e.expr.name)
-                if slot is None:
-                    llty, g = self.globals.get(e.expr.name, (LLVM_INT, None))
-                    cur = self.ir.tmp()
-                    self.ir.emit(f"  {cur} = load {llty}, {llty}* {g}")
-                    nxt = self.ir.tmp()
-                    op = "add" if e.oper == '++' else "sub"
-                    self.ir.emit(f"  {nxt} = {op} {llty} {cur}, 1")
-                    self.ir.emit(f"  store {llty} {nxt}, {llty}* {g}")
-                    return ValueRef(llty, cur)
-                else:
-                    cur = self.ir.tmp()
-                    self.ir.emit(f"  {cur} = load {slot.ty}, {slot.ty}* {slot.name}")
-                    nxt = self.ir.tmp()
-                    op = "add" if e.oper == '++' else "sub"
-                    self.ir.emit(f"  {nxt} = {op} {slot.ty} {cur}, 1")
-                    self.ir.emit(f"  store {slot.ty} {nxt}, {slot.ty}* {slot.name}")
-                    return ValueRef(slot.ty, cur)
-
-        # Operador binario
-        if isinstance(e, BinOper):
-            a = self._gen_expr(e.left, scope)
-            b = self._gen_expr(e.right, scope)
-            
-            # Operaciones con float
-            if a.ty == LLVM_FLOAT or b.ty == LLVM_FLOAT:
-                if a.ty != LLVM_FLOAT:
-                    ca = self.ir.tmp()
-                    self.ir.emit(f"  {ca} = sitofp {a.ty} {a.name} to double")
-                    a = ValueRef(LLVM_FLOAT, ca)
-                if b.ty != LLVM_FLOAT:
-                    cb = self.ir.tmp()
-                    self.ir.emit(f"  {cb} = sitofp {b.ty} {b.name} to double")
-                    b = ValueRef(LLVM_FLOAT, cb)
-                
-                opmap = {'+':'fadd','-':'fsub','*':'fmul','/':'fdiv'}
-                if e.oper in opmap:
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = {opmap[e.oper]} double {a.name}, {b.name}")
-                    return ValueRef(LLVM_FLOAT, r)
-                
-                cmpmap = {'==':'oeq','!=':'one','<':'olt','<=':'ole','>':'ogt','>=':'oge'}
-                if e.oper in cmpmap:
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = fcmp {cmpmap[e.oper]} double {a.name}, {b.name}")
-                    return ValueRef(LLVM_BOOL, r)
-            
-            # Operaciones con enteros
+        if isinstance(e.expr, Identifier):
+            slot = scope.get(e.expr.name)
+            if slot is None:
+                llty, g = self.globals.get(e.expr.name, (LLVM_INT, None))
+                cur = self.ir.tmp()
+                nxt = self.ir.tmp()
+                op = "add nsw" if e.oper == '++' else "sub nsw"
+                self.ir.emit_many((
+                    f"  {cur} = load {llty}, {llty}* {g}",
+                    f"  {nxt} = {op} {llty} {cur}, 1",
+                    f"  store {llty} {nxt}, {llty}* {g}",
+                ))
+                return ValueRef(llty, cur)
             else:
-                if e.oper == '+':
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = add {a.ty} {a.name}, {b.name}")
-                    return ValueRef(a.ty, r)
-                if e.oper == '-':
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = sub {a.ty} {a.name}, {b.name}")
-                    return ValueRef(a.ty, r)
-                if e.oper == '*':
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = mul {a.ty} {a.name}, {b.name}")
-                    return ValueRef(a.ty, r)
-                if e.oper == '/':
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = sdiv {a.ty} {a.name}, {b.name}")
-                    return ValueRef(a.ty, r)
-                if e.oper == '%':
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = srem {a.ty} {a.name}, {b.name}")
-                    return ValueRef(a.ty, r)
-                
-                cmpmap = {'==':'eq','!=':'ne','<':'slt','<=':'sle','>':'sgt','>=':'sge'}
-                if e.oper in cmpmap:
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = icmp {cmpmap[e.oper]} {a.ty} {a.name}, {b.name}")
-                    return ValueRef(LLVM_BOOL, r)
-                
-                if e.oper in ('&&','||'):
-                    aa = self._as_i1(a)
-                    bb = self._as_i1(b)
-                    op = "and" if e.oper == '&&' else "or"
-                    r = self.ir.tmp()
-                    self.ir.emit(f"  {r} = {op} i1 {aa.name}, {bb.name}")
-                    return ValueRef(LLVM_BOOL, r)
-
+                cur = self.ir.tmp()
+                nxt = self.ir.tmp()
+                op = "add nsw" if e.oper == '++' else "sub nsw"
+                self.ir.emit_many((
+                    f"  {cur} = load {slot.ty}, {slot.ty}* {slot.name}",
+                    f"  {nxt} = {op} {slot.ty} {cur}, 1",
+                    f"  store {slot.ty} {nxt}, {slot.ty}* {slot.name}",
+                ))
+                return ValueRef(slot.ty, cur)
         return ValueRef(LLVM_INT, "0")
 
-    def _string_global(self, s: str) -> str:
-        key = f"@.str.{abs(hash(s)) & 0xFFFFFF:x}"
-        for ln in self.ir.lines:
-            if ln.startswith(f"{key} ="):
-                return key
+    def _gen_binop(self, e: BinOper, scope: Scope) -> ValueRef:
+        # Operador binario
+        if e.oper in _LOGIC_OPS:
+            return self._gen_logic(e, scope)
+        a = self._gen_expr(e.left, scope)
+        b = self._gen_expr(e.right, scope)
+        
+        # Operaciones con float
+        if a.ty == LLVM_FLOAT or b.ty == LLVM_FLOAT:
+            if a.ty != LLVM_FLOAT:
+                ca = self.ir.tmp()
+                self.ir.emit(f"  {ca} = sitofp {a.ty} {a.name} to double")
+                a = ValueRef(LLVM_FLOAT, ca)
+            if b.ty != LLVM_FLOAT:
+                cb = self.ir.tmp()
+                self.ir.emit(f"  {cb} = sitofp {b.ty} {b.name} to double")
+                b = ValueRef(LLVM_FLOAT, cb)
+
+            tpl = _FLOAT_BINOPS.get(e.oper)
+            if tpl:
+                r = self.ir.tmp()
+                self.ir.emit(tpl % (r, a.name, b.name))
+                return ValueRef(LLVM_FLOAT, r)
 
-        bs = s.encode("utf-8")
-        init = ", ".join(f"i8 {b}" for b in bs) + ", i8 0"
-        line = f"{key} = private unnamed_addr constant [{len(bs)+1} x i8] [{init}]"
+            tpl = _FLOAT_CMPS.get(e.oper)
+            if tpl:
+                r = self.ir.tmp()
+                self.ir.emit(tpl % (r, a.name, b.name))
+                return ValueRef(LLVM_BOOL, r)
 
-        insert_at = 0
-        for j, ln in enumerate(self.ir.lines):
-            if ln.startswith("@.fmt_") or ln.startswith("@.len."):
-                insert_at = j + 1
+        # Operaciones con enteros
+        else:
+            if a.ty == LLVM_INT and b.ty == LLVM_INT:
+                folded = _fold_int(e.oper, a.name, b.name)
+                if folded is not None:
+                    return folded
+            tpl = _INT_BINOPS.get(e.oper)
+            if tpl:
+                r = self.ir.tmp()
+                self.ir.emit(tpl % (r, a.ty, a.name, b.name))
+                return ValueRef(a.ty, r)
 
-        self.ir.lines.insert(insert_at, line)
-        return key
+            tpl = _INT_CMPS.get(e.oper)
+            if tpl:
+                r = self.ir.tmp()
+                self.ir.emit(tpl % (r, a.ty, a.name, b.name))
+                return ValueRef(LLVM_BOOL, r)
+        return ValueRef(LLVM_INT, "0")
 
-    def _gen_print(self, v: ValueRef):
+    def _gen_logic(self, e: BinOper, scope: Scope) -> ValueRef:
+        # && y || con cortocircuito: el lado derecho solo se evalúa si hace
+        # falta y el resultado sale de un phi. Cada lado termina en un bloque
+        # propio (sc.lhs./sc.rhs.) para conocer el predecesor del phi aunque
+        # la subexpresión haya abierto bloques (otro && anidado).
+        is_and = e.oper == '&&'
+        lhsL = self.ir.label("sc.lhs.")
+        rhsL = self.ir.label("sc.rhs.")
+        rendL = self.ir.label("sc.rend.")
+        endL = self.ir.label("sc.end.")
+        a = self._as_i1(self._gen_expr(e.left, scope))
+        self.ir.emit_many((f"  br label %{lhsL}", f"{lhsL}:"))
+        if is_and:
+            self.ir.emit(f"  br i1 {a.name}, label %{rhsL}, label %{endL}, !unpredictable !{{}}")
+        else:
+            self.ir.emit(f"  br i1 {a.name}, label %{endL}, label %{rhsL}, !unpredictable !{{}}")
+        self.ir.emit(f"{rhsL}:")
+        b = self._as_i1(self._gen_expr(e.right, scope))
+        r = self.ir.tmp()
+        self.ir.emit_many((
+            f"  br label %{rendL}",
+            f"{rendL}:",
+            f"  br label %{endL}",
+            f"{endL}:",
+            _LOGIC_OPS[e.oper] % (r, lhsL, b.name, rendL),
+        ))
+        return ValueRef(LLVM_BOOL, r)
+
+    def _string_global(self, s: str) -> Tuple[str, str]:
+        # Un global por literal distinto, numerado en orden de aparición: los
+        # usos repetidos comparten nombre y dos textos nunca chocan (antes se
+        # nombraban con 24 bits de hash(), que además cambia en cada ejecución).
+        # Devuelve (nombre, tipo "[N x i8]"), con N en bytes UTF-8 + el \0.
+        ref = self._str_pool.get(s)
+        if ref is None:
+            key = f"@.str.{len(self._str_pool)}"
+            bs = s.encode("utf-8")
+            arr_ty = f"[{len(bs)+1} x i8]"
+            ref = self._str_pool[s] = (key, arr_ty)
+            init = ", ".join(f"i8 {b}" for b in bs) + ", i8 0"
+            self.ir.consts[key] = f"{key} = private unnamed_addr constant {arr_ty} [{init}]"
+        return ref
+
+    def _gen_print(self, v: ValueRef) -> None:
         if v.ty in (LLVM_INT, LLVM_BOOL):
             fmt = self.ir.tmp()
-            self.ir.emit(f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_int, i32 0, i32 0')
-            self.ir.emit(f"  call i32 (i8*, ...) @printf(i8* {fmt}, i32 {v.name})")
+            self.ir.emit_many((
+                f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_int, i32 0, i32 0',
+                f"  call i32 (i8*, ...) @printf(i8* nonnull {fmt}, i32 {v.name})",
+            ))
         elif v.ty == LLVM_CHAR:
             fmt = self.ir.tmp()
-            self.ir.emit(f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_char, i32 0, i32 0')
-            self.ir.emit(f"  call i32 (i8*, ...) @printf(i8* {fmt}, i8 {v.name})")
+            self.ir.emit_many((
+                f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_char, i32 0, i32 0',
+                f"  call i32 (i8*, ...) @printf(i8* nonnull {fmt}, i8 {v.name})",
+            ))
         elif v.ty == LLVM_FLOAT:
             fmt = self.ir.tmp()
-            self.ir.emit(f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_float, i32 0, i32 0')
-            self.ir.emit(f"  call i32 (i8*, ...) @printf(i8* {fmt}, double {v.name})")
+            self.ir.emit_many((
+                f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_float, i32 0, i32 0',
+                f"  call i32 (i8*, ...) @printf(i8* nonnull {fmt}, double {v.name})",
+            ))
         elif v.ty == LLVM_STRING:
             fmt = self.ir.tmp()
-            self.ir.emit(f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_str, i32 0, i32 0')
-            self.ir.emit(f"  call i32 (i8*, ...) @printf(i8* {fmt}, i8* {v.name})")
+            self.ir.emit_many((
+                f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_str, i32 0, i32 0',
+                f"  call i32 (i8*, ...) @printf(i8* nonnull {fmt}, i8* {v.name})",
+            ))
         else:
             fmt = self.ir.tmp()
-            self.ir.emit(f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_int, i32 0, i32 0')
-            self.ir.emit(f"  call i32 (i8*, ...) @printf(i8* {fmt}, i32 {v.name})")
+            self.ir.emit_many((
+                f'  {fmt} = getelementptr inbounds [4 x i8], [4 x i8]* @.fmt_int, i32 0, i32 0',
+                f"  call i32 (i8*, ...) @printf(i8* nonnull {fmt}, i32 {v.name})",
+            ))
 
     def _gen_array_ptr(self, idx: ArrayIndex, scope: Scope) -> Tuple[str, str]:
         """Calcula el puntero base para acceder a un arreglo."""
@@ -890,43 +1083,105 @@ class Codegen:
                     baseptr = self.ir.tmp()
                     self.ir.emit(f"  {baseptr} = getelementptr inbounds {v.ty}, {v.ty}* {v.name}, i32 0, i32 0")
                     return baseptr, T
-                # Puntero T*
+                # Puntero T* (malloc o parámetro): se indexa enseguida, así
+                # que nunca es null; !nonnull se lo dice a LLVM
                 if v.ty.endswith('*'):
                     loaded = self.ir.tmp()
                     baseT  = v.ty[:-1]
-                    self.ir.emit(f"  {loaded} = load {v.ty}, {v.ty}* {v.name}")
+                    self.ir.emit(f"  {loaded} = load {v.ty}, {v.ty}* {v.name}, !nonnull !{{}}")
                     return loaded, baseT
 
             # Global [N x T]
-            if idx.array.name in self.globals:
-                gty, gname = self.globals[idx.array.name]
+            glob = self.globals.get(idx.array.name)
+            if glob is not None:
+                gty, gname = glob
                 if gty.startswith('['):
                     T = gty.split(' x ')[-1].rstrip(']')
                     baseptr = self.ir.tmp()
                     self.ir.emit(f"  {baseptr} = getelementptr inbounds {gty}, {gty}* {gname}, i32 0, i32 0")
                     return baseptr, T
 
-        # Fallback
-        base = self.ir.tmp()
-        self.ir.emit(f"  {base} = bitcast i8* null to i32*")
-        return base, LLVM_INT
+        # Fallback: la constante null ya tiene tipo i32*, sin instrucción
+        return "null", LLVM_INT
+
+
+Codegen._stmt_dispatch.update({
+    VarDecl:     Codegen._gen_vardecl_stmt,
+    PrintStmt:   Codegen._gen_print_stmt,
+    ReturnStmt:  Codegen._gen_return,
+    IfStmt:      Codegen._gen_if,
+    WhileStmt:   Codegen._gen_while,
+    DoWhileStmt: Codegen._gen_dowhile,
+    ForStmt:     Codegen._gen_for,
+    Block:       Codegen._gen_nested_block,
+})
+
+Codegen._expr_dispatch.update({
+    Integer:     Codegen._gen_int,
+    Boolean:     Codegen._gen_bool,
+    Char:        Codegen._gen_char,
+    Float:       Codegen._gen_float,
+    String:      Codegen._gen_string,
+    Identifier:  Codegen._gen_ident,
+    Assign:      Codegen._gen_assign,
+    ArrayIndex:  Codegen._gen_index,
+    Call:        Codegen._gen_call,
+    UnaryOper:   Codegen._gen_unary,
+    UnaryOp:     Codegen._gen_unaryop,
+    PostfixOper: Codegen._gen_postfix,
+    BinOper:     Codegen._gen_binop,
+})
 
 
 # ===== Carga + compile =====
-txt = open(filename, encoding="utf-8").read()
-set_source(filename, txt)
-ast = parse(txt)
-em = IREmitter()
-cg = Codegen(em)
-cg.gen_program(ast)
-output_ir = em.finalize()
-
-if check is not None:
-    try:
-        with open("out.ll", "w", encoding="utf-8") as f:
-            f.write(output_ir)
-        print("✓ Archivo out.ll generado con éxito.", file=sys.stderr)
-    except Exception as e:
-        print(f"✗ Error al escribir out.ll: {e}", file=sys.stderr)
-
-sys.stdout.write(output_ir)
+def main(argv: List[str]) -> None:
+    parser_mod_name  = "parser"
+    checker_mod_name = "checker"
+
+    argv = list(argv)
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--parser" and i + 1 < len(argv):
+            parser_mod_name = argv[i + 1]
+            argv.pop(i); argv.pop(i)
+            continue
+        if argv[i] == "--checker" and i + 1 < len(argv):
+            checker_mod_name = argv[i + 1]
+            argv.pop(i); argv.pop(i)
+            continue
+        i += 1
+
+    if not argv:
+        sys.exit("Uso: python bminor2llvm.py archivo.bminor")
+
+    filename = argv[0]
+
+    parser_mod  = _import_mod(parser_mod_name)
+    checker_mod = _import_mod(checker_mod_name)
+
+    if parser_mod is None or not hasattr(parser_mod, "parse"):
+        sys.exit("Debes proveer un parser válido.")
+    parse = getattr(parser_mod, "parse")
+    check = getattr(checker_mod, "check", None) if checker_mod is not None else None
+
+    txt = open(filename, encoding="utf-8").read()
+    set_source(filename, txt)
+    ast = parse(txt)
+    em = IREmitter()
+    cg = Codegen(em)
+    cg.gen_program(ast)
+    output_ir = em.finalize()
+
+    if check is not None:
+        try:
+            with open("out.ll", "w", encoding="utf-8") as f:
+                f.write(output_ir)
+            print("✓ Archivo out.ll generado con éxito.", file=sys.stderr)
+        except Exception as e:
+            print(f"✗ Error al escribir out.ll: {e}", file=sys.stderr)
+
+    sys.stdout.write(output_ir)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -597,8 +597,7 @@ if __name__ == '__main__':
     try:
         lexer = Lexer()
         parser = Parser()
-        tokens = list(lexer.tokenize(source_code))
-        ast = parser.parse(iter(tokens))
+        ast = parser.parse(lexer.tokenize(source_code))
         
         if errors.errors_detected():
             sys.exit(1)
@@ -2,9 +2,19 @@
 #
 # Analizador Léxico para el lenguaje B-Minor
 
-from tabulate import tabulate     # Imprimir la tabla de tokens en formato "grid"
 import sly                        # SLY: framework tipo Lex/Yacc para Python
 import re                         # Expresiones regulares (validaciones/reemplazos)
+import sys                        # sys.intern para los nombres de identificadores
+
+# Tabla de escapes soportados (compartida por char y string) y regex
+# precompiladas: se construyen una vez y no en cada token
+ESCAPES = {
+    'a': '\a', 'b': '\b', 'e': '\x1b', 'f': '\f',
+    'n': '\n', 'r': '\r', 't': '\t', 'v': '\v',
+    '\\': '\\', "'": "'", '"': '"',
+}
+_HEX_RE = re.compile(r'[0-9A-Fa-f]+')
+_ESC_RE = re.compile(r'\\(0x[0-9A-Fa-f]+|.)')
 
 class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
     tokens = {                    # Conjunto de tipos de tokens simbólicos que producirá el lexer
@@ -38,9 +48,9 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
     def ignore_newline(self, t):
         self.lineno += t.value.count('\n')  # Actualiza el número de línea del lexer
 
-    @_(r'//.*')                    # Comentario de una línea tipo C++
-    def ignore_cppcomment(self, t):
-        pass                       # Se ignora completamente
+    # Comentario de una línea tipo C++. Como patrón `ignore_` en texto (no
+    # función) SLY lo descarta dentro de su bucle, sin llamada Python por comentario
+    ignore_cppcomment = r'//.*'
 
     @_(r'/\*')                     # Inicio de comentario de bloque
     def COMMENT(self, t):
@@ -86,6 +96,13 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
     ID['while'] = WHILE
     ID['do'] = DO 
 
+    # Acción para los ID que no son reservadas (el remapeo ocurre antes):
+    # se internan, así cada nombre repetido es un único objeto str y las
+    # búsquedas en tablas de símbolos comparan por identidad
+    def ID(self, t):
+        t.value = sys.intern(t.value)
+        return t
+
     # -----------------------------
     # Operadores compuestos
     # -----------------------------
@@ -143,13 +160,7 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
     @_(r"'([^\\\n']|\\.)*'")       # Coincide: 'x' o secuencias con escape; no permite salto de línea
     def CHAR_LITERAL(self, t):
         val = t.value[1:-1]        # Quita comillas simples -> contenido del char
-
-        # Tabla de escapes soportados (coincide con strings)
-        escapes = {
-            'a': '\a', 'b': '\b', 'e': '\x1b', 'f': '\f',
-            'n': '\n', 'r': '\r', 't': '\t', 'v': '\v',
-            '\\': '\\', "'": "'", '"': '"',
-        }
+        escapes = ESCAPES          # Tabla de escapes (coincide con strings)
 
         # Si no es escape y tiene más de 1 carácter -> error (p.ej., 'ab')
         if not val.startswith('\\') and len(val) != 1:
@@ -173,7 +184,7 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
             # Hex tipo \0xHH...
             if val.startswith('0x'):
                 hexpart = val[2:]                               # Parte hexadecimal
-                if not re.fullmatch(r'[0-9A-Fa-f]+', hexpart):  # Valida formato hexadecimal
+                if not _HEX_RE.fullmatch(hexpart):              # Valida formato hexadecimal
                     print(f"Line {t.lineno}: Secuencia hexadecimal inválida: \\{val}")
                     return None
                 code = int(hexpart, 16)                         # Convierte a código numérico
@@ -217,12 +228,13 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
             t.value = ""
             return None
 
+        # Sin backslash no hay escapes que resolver (el caso más común)
+        if '\\' not in val:
+            t.value = val
+            return t
+
         # Mapeo de escapes igual que en char
-        escapes = {
-            'a': '\a','b': '\b','e': '\x1b','f': '\f',
-            'n': '\n','r': '\r','t': '\t','v': '\v',
-            '\\': '\\',"'" : "'",'"': '"',
-        }
+        escapes = ESCAPES
 
         # Función auxiliar para reemplazar escapes dentro del string
         def replace_escape(match):
@@ -240,7 +252,7 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
                 return ''
 
         # Reemplaza todas las secuencias \X por su valor (o '' si fueron inválidas)
-        val = re.sub(r'\\(0x[0-9A-Fa-f]+|.)', replace_escape, val)
+        val = _ESC_RE.sub(replace_escape, val)
         t.value = val
         return t
 
@@ -255,6 +267,7 @@ class Lexer(sly.Lexer):           # El lexer hereda de sly.Lexer
 # Función auxiliar para tokenizar e imprimir
 # -----------------------------------------
 def tokenize(txt):
+    from tabulate import tabulate                # Tabla "grid"; se importa solo aquí (pesa ~30 ms)
     lexer = Lexer()                              # Instancia del lexer
     tokens = [(tok.type, repr(tok.value), tok.lineno)   # Construye filas (tipo, valor, línea)
               for tok in lexer.tokenize(txt)]   # tokeniza el texto completo
@@ -265,8 +278,8 @@ def tokenize(txt):
 # Punto de entrada si se ejecuta como script
 # -----------------------------------------
 if __name__ == '__main__':
-    import sys
     if len(sys.argv) != 2:                      # Verifica uso correcto
         print("usage: python lexer.py filename")
         exit(1)
-    tokenize(open(sys.argv[1], encoding='utf-8').read())  # Lee archivo y tokeniza
+    with open(sys.argv[1], 'rb') as f:          # Lectura binaria de una vez (y se cierra)
+        tokenize(f.read().decode('utf-8'))      # Decodifica y tokeniza
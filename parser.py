@@ -2,6 +2,7 @@
 # Parser para SLY: construye el AST a partir de los tokens del lexer.
 
 import logging
+import os
 import sly
 
 from lexer  import Lexer
@@ -20,7 +21,9 @@ class Parser(sly.Parser):
     log = logging.getLogger()
     log.setLevel(logging.ERROR)
     # expected_shift_reduce = 1 # Opcional, pero bueno mantenerlo
-    debugfile = 'grammar.txt'
+    # El volcado de la gramática y la tabla LR (~7.5k líneas) se escribía en
+    # cada import; ahora solo si se pide: BMINOR_GRAMMAR_DEBUG=grammar.txt
+    debugfile = os.environ.get('BMINOR_GRAMMAR_DEBUG') or None
 
     # Tokens del lexer
     tokens = Lexer.tokens
@@ -475,16 +478,16 @@ def ast_to_dict(node):
 
 def parse(txt: str):
     l = Lexer()
-    tokens = list(l.tokenize(txt))   # evitar consumir el generador
     p = Parser()
-    return p.parse(iter(tokens))
+    return p.parse(l.tokenize(txt))  # el parser es el único que consume los tokens
 
 if __name__ == '__main__':
     import sys
     from rich.console import Console
     if len(sys.argv) != 2:
         raise SystemExit("Usage: python parser.py <filename>")
-    txt = open(sys.argv[1], encoding='utf-8').read()
+    with open(sys.argv[1], 'rb') as f:
+        txt = f.read().decode('utf-8')
     
     # Es crucial llamar a set_source si quieres ver el error con la línea de código
     import importlib